@@ -3,8 +3,8 @@
 
 // Application State
 let isSystemRunning = false;
-let checkIntervalId = null;
-let uiPollIntervalId = null;
+let eventSource = null;
+let alertTimerId = null;
 let detectedMeetings = [];
 let alertedMeetings = new Set(); // Track which meetings we've already alerted for
 let allowedMailIds = [];
@@ -19,11 +19,38 @@ let currentMeetingLink = null;
 
 document.addEventListener('DOMContentLoaded', function() {
     loadSettings();
-    updateStats();
     addLog('info', 'Application loaded successfully');
     renderAccounts();
+    whenBackendReady().then(updateStats);
 });
 
+// The window can open before the backend is listening: poll its health
+// check with a short backoff instead of failing the first requests
+let backendReady = null;
+
+function whenBackendReady(timeoutMs = 30000) {
+    if (!backendReady) {
+        backendReady = (async () => {
+            const deadline = Date.now() + timeoutMs;
+            let delay = 50;
+            while (Date.now() < deadline) {
+                try {
+                    const response = await fetch('http://localhost:5000/api/health');
+                    if (response.ok) return true;
+                } catch (e) {
+                    // Not listening yet
+                }
+                await new Promise(resolve => setTimeout(resolve, delay));
+                delay = Math.min(delay * 2, 1000);
+            }
+            addLog('error', 'Backend did not respond on http://localhost:5000');
+            backendReady = null;
+            return false;
+        })();
+    }
+    return backendReady;
+}
+
 function toggleSystem() {
     if (isSystemRunning) {
         stopSystem();
@@ -42,11 +69,11 @@ async function startSystem() {
     document.getElementById('startBtn').innerHTML = '<span>⏸️</span> Stop Monitoring';
     document.getElementById('startBtn').classList.add('btn-danger');
     document.getElementById('systemStatus').classList.add('active');
-    // Backend scan interval
-    checkIntervalId = setInterval(checkEmails, interval);
-    // UI poll interval (every 15s)
-    if (uiPollIntervalId) clearInterval(uiPollIntervalId);
-    uiPollIntervalId = setInterval(checkEmails, 15000);
+    // New meetings and stats are pushed by the backend; load the current list once
+    connectEvents();
+    // Alert window check is local only, no network traffic
+    if (alertTimerId) clearInterval(alertTimerId);
+    alertTimerId = setInterval(checkAlerts, 30000);
     addLog('success', `System started - checking every ${interval/60000} minutes`);
     setTimeout(checkEmails, 2000);
     saveSettings();
@@ -61,13 +88,10 @@ async function startSystem() {
 
 async function stopSystem() {
     isSystemRunning = false;
-    if (checkIntervalId) {
-        clearInterval(checkIntervalId);
-        checkIntervalId = null;
-    }
-    if (uiPollIntervalId) {
-        clearInterval(uiPollIntervalId);
-        uiPollIntervalId = null;
+    disconnectEvents();
+    if (alertTimerId) {
+        clearInterval(alertTimerId);
+        alertTimerId = null;
     }
     document.getElementById('startBtn').innerHTML = '<span>▶️</span> Start Monitoring';
     document.getElementById('startBtn').classList.remove('btn-danger');
@@ -165,7 +189,7 @@ function renderMeetingCard(meeting) {
                     <span>⏰</span> ${timeStr}
                 </div>
                 <div class="meeting-detail">
-                    <span>👤</span> Account: ${meeting.account || 'Unknown account'}
+                    <span>👤</span> Account: ${meetingAccounts(meeting).join(', ') || 'Unknown account'}
                 </div>
                 <div class="meeting-detail">
                     <span>🌐</span> ${meeting.platform || 'Unknown'}
@@ -234,7 +258,7 @@ function updateMeetingsDisplay() {
                         <span>👤</span> ${meeting.sender || 'Unknown'}
                     </div>
                     <div class="meeting-detail">
-                        <span>📧</span> <b>${meeting.account || 'Unknown account'}</b>
+                        <span>📧</span> <b>${meetingAccounts(meeting).join(', ') || 'Unknown account'}</b>
                     </div>
                     <div class="meeting-detail">
                         <span>🌐</span> ${meeting.platform || 'Unknown'}
@@ -262,6 +286,11 @@ function updateMeetingsDisplay() {
 }
 
 // Account filter dropdown logic
+// Every account that received a meeting (duplicates across accounts are merged server-side)
+function meetingAccounts(meeting) {
+    return meeting.accounts || (meeting.account ? [meeting.account] : []);
+}
+
 function populateAccountFilter(accounts) {
     const filter = document.getElementById('accountFilter');
     filter.innerHTML = '<option value="all">All Accounts</option>';
@@ -292,6 +321,10 @@ async function updateStats() {
     } catch (e) {
         addLog('error', 'Failed to fetch stats: ' + e.message);
     }
+    renderStats();
+}
+
+function renderStats() {
     document.getElementById('totalMeetings').textContent = stats.totalMeetings;
     document.getElementById('upcomingMeetings').textContent = stats.upcomingMeetings;
     document.getElementById('emailsScanned').textContent = stats.emailsScanned;
@@ -352,7 +385,68 @@ document.addEventListener('keydown', function(e) {
     }
 });
 
-setInterval(updateStats, 30000);
+// Server-Sent Events from /api/events replace polling; the browser reconnects
+// on its own and resumes from the last event ID it saw.
+function connectEvents() {
+    if (eventSource) return;
+    eventSource = new EventSource('http://localhost:5000/api/events');
+    eventSource.addEventListener('meeting', (e) => {
+        if (ingestMeetings([JSON.parse(e.data)]) > 0) {
+            updateMeetingsDisplay();
+            checkAlerts();
+        }
+    });
+    eventSource.addEventListener('stats', (e) => {
+        stats = Object.assign(stats, JSON.parse(e.data));
+        renderStats();
+    });
+    eventSource.addEventListener('account', (e) => {
+        const status = JSON.parse(e.data);
+        if (status.status === 'error') {
+            addLog('error', `Scan failed for ${status.account}: ${status.error}`);
+        } else if (status.status === 'unauthenticated') {
+            addLog('error', `Could not authenticate ${status.account}`);
+        } else if (status.status === 'idle') {
+            addLog('debug', `Scanned ${status.account}`);
+        }
+    });
+    // Calendar invite updates and cancellations, matched on the original meeting id
+    eventSource.addEventListener('meeting-updated', (e) => {
+        const meeting = JSON.parse(e.data);
+        meeting.time = meeting.time ? new Date(meeting.time) : null;
+        detectedMeetings = detectedMeetings.map(m => m.id === meeting.id ? meeting : m);
+        addLog('info', `Meeting updated: ${meeting.title}`);
+        updateMeetingsDisplay();
+    });
+    eventSource.addEventListener('meeting-cancelled', (e) => {
+        const meeting = JSON.parse(e.data);
+        detectedMeetings = detectedMeetings.filter(m => m.id !== meeting.id);
+        addLog('warning', `Meeting cancelled: ${meeting.title}`);
+        updateMeetingsDisplay();
+    });
+    // Server-side reminder, fired alertTime minutes before the meeting
+    eventSource.addEventListener('alarm', (e) => {
+        const meeting = JSON.parse(e.data);
+        meeting.time = new Date(meeting.startsAt * 1000);
+        const meetingId = meeting.id || `${meeting.title}-${meeting.time.getTime()}`;
+        if (!alertedMeetings.has(meetingId)) {
+            alertedMeetings.add(meetingId);
+            showMeetingAlert(meeting);
+        }
+    });
+    // Missed more events than the server keeps: reload the full list
+    eventSource.addEventListener('resync', () => {
+        checkEmails();
+        updateStats();
+    });
+}
+
+function disconnectEvents() {
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+}
 
 function showMeetingNotification(title, body) {
   if (window.electronAPI && window.electronAPI.showNotification) {
@@ -383,71 +477,11 @@ async function checkEmails() {
             throw new Error(`API error: ${response.status}`);
         }
         const data = await response.json();
-        console.log("API DATA:", data);
         // data should be an array of meeting objects
         if (Array.isArray(data) && data.length > 0) {
-            let newMeetings = 0;
-            data.forEach(meeting => {
-                console.log("PROCESSING:", meeting);
-                // Convert meeting.time to Date object if it's a string
-                if (typeof meeting.time === 'string') {
-                    meeting.time = new Date(meeting.time);
-                }
-                if (!meeting.time) {
-                    console.error("NULL TIME FOUND", meeting);
-                    return;
-                }
-                console.log(
-                    "TITLE:", meeting.title,
-                    "TIME:", meeting.time,
-                    "TYPE:", typeof meeting.time
-                );
-                // Avoid duplicates by checking id or time/title
-                const exists = detectedMeetings.some(m => {
-                    if (m.id === meeting.id) return true;
-
-                    if (
-                        m.title === meeting.title &&
-                        m.time instanceof Date &&
-                        !isNaN(m.time) &&
-                        meeting.time instanceof Date &&
-                        !isNaN(meeting.time)
-                    ) {
-                        return m.time.getTime() === meeting.time.getTime();
-                    }
-
-                return false;
-            });
-                // Filter by allowedMailIds if set
-                const senderEmail = (meeting.sender || '').toLowerCase();
-                const allowed = allowedMailIds.length === 0 || allowedMailIds.some(id => senderEmail.includes(id));
-                if (!exists && allowed) {
-                    detectedMeetings.push(meeting);
-                    stats.totalMeetings++;
-                    newMeetings++;
-                    addLog('success', `Meeting detected: ${meeting.title}`);
-                }
-            });
-            
+            const newMeetings = ingestMeetings(data);
             // Check ALL detected meetings for alerts on every scan
-            const alertTime = parseInt(document.getElementById('alertTime').value) * 60000;
-            detectedMeetings.forEach(meeting => {
-                if ( meeting.time instanceof Date &&
-                    !isNaN(meeting.time)
-                ) {
-                    const timeUntilMeeting =
-                        meeting.time.getTime() - Date.now();
-                    const meetingId = meeting.id || `${meeting.title}-${meeting.time.getTime()}`;
-                    
-                    // Show alert if: time until meeting is positive (hasn't passed), within alert window, and we haven't already alerted
-                    if (timeUntilMeeting > 0 && timeUntilMeeting <= alertTime && !alertedMeetings.has(meetingId)) {
-                        showMeetingAlert(meeting);
-                        alertedMeetings.add(meetingId);
-                        addLog('info', `Alert shown for: ${meeting.title}`);
-                    }
-                }
-            });
-            
+            checkAlerts();
             if (newMeetings === 0) {
                 addLog('debug', 'No new meetings found in recent emails');
             }
@@ -460,6 +494,66 @@ async function checkEmails() {
     }
 }
 
+// Add meetings from the backend to detectedMeetings; returns how many were new
+function ingestMeetings(data) {
+    let newMeetings = 0;
+    data.forEach(meeting => {
+        // Convert meeting.time to Date object if it's a string
+        if (typeof meeting.time === 'string') {
+            meeting.time = new Date(meeting.time);
+        }
+        if (!meeting.time) {
+            console.error("NULL TIME FOUND", meeting);
+            return;
+        }
+        // Avoid duplicates by checking id or time/title
+        const exists = detectedMeetings.some(m => {
+            if (m.id === meeting.id) return true;
+
+            if (
+                m.title === meeting.title &&
+                m.time instanceof Date &&
+                !isNaN(m.time) &&
+                meeting.time instanceof Date &&
+                !isNaN(meeting.time)
+            ) {
+                return m.time.getTime() === meeting.time.getTime();
+            }
+
+            return false;
+        });
+        // Filter by allowedMailIds if set
+        const senderEmail = (meeting.sender || '').toLowerCase();
+        const allowed = allowedMailIds.length === 0 || allowedMailIds.some(id => senderEmail.includes(id));
+        if (!exists && allowed) {
+            detectedMeetings.push(meeting);
+            newMeetings++;
+            addLog('success', `Meeting detected: ${meeting.title}`);
+        }
+    });
+    return newMeetings;
+}
+
+function checkAlerts() {
+    const alertTime = parseInt(document.getElementById('alertTime').value) * 60000;
+    detectedMeetings.forEach(meeting => {
+        if ( meeting.time instanceof Date &&
+            !isNaN(meeting.time)
+        ) {
+            const timeUntilMeeting =
+                meeting.time.getTime() - Date.now();
+            const meetingId = meeting.id || `${meeting.title}-${meeting.time.getTime()}`;
+
+            // Show alert if: time until meeting is positive (hasn't passed), within alert window, and we haven't already alerted
+            if (timeUntilMeeting > 0 && timeUntilMeeting <= alertTime && !alertedMeetings.has(meetingId)) {
+                showMeetingAlert(meeting);
+                alertedMeetings.add(meetingId);
+                addLog('info', `Alert shown for: ${meeting.title}`);
+            }
+        }
+    });
+}
+
 function renderAccounts() {
     const container = document.getElementById('accountsContainer');
     if (!container) return;
@@ -485,7 +579,7 @@ function renderMeetings() {
     const selectedAccount = getSelectedAccountFilter();
     let filteredMeetings = window.meetings;
     if (selectedAccount && selectedAccount !== 'all') {
-        filteredMeetings = window.meetings.filter(m => m.account === selectedAccount);
+        filteredMeetings = window.meetings.filter(m => meetingAccounts(m).includes(selectedAccount));
     }
     if (filteredMeetings.length === 0) {
         container.innerHTML = `<p style="text-align: center; color: #a0aec0; padding: 20px;">No meetings found for this account.</p>`;
@@ -602,5 +696,5 @@ function fetchAccounts() {
 
 // On load, fetch accounts from backend
 window.addEventListener('DOMContentLoaded', () => {
-    fetchAccounts();
+    whenBackendReady().then(fetchAccounts);
 });
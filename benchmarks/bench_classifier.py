@@ -0,0 +1,87 @@
+"""Micro-benchmark: per-call regex lists vs the precompiled MeetingClassifier.
+
+Run from the repo root:  python -m benchmarks.bench_classifier
+"""
+import random
+import re
+import time
+
+from src.mail_processor import get_classifier
+
+KEYWORDS = ["meeting", "zoom", "conference", "appointment", "masterclass", "workshop", "meet", "gmeet", "google meet"]
+
+SAMPLES = [
+    "Subject: Weekly sync\n\nHi team, our weekly sync is on Monday at 10:30 AM. Join at https://meet.google.com/abc-defg-hij",
+    "Subject: Masterclass\n\nJoin us for the Python masterclass on 12th June 2025 at 5pm IST.",
+    "Subject: Your receipt\n\nThanks for your order #4821. Total charged: $42.00. Questions? Reply to this email.",
+    "Subject: Newsletter\n\n" + "Top stories this week from around the web, curated for you. " * 60,
+    "Subject: Zoom call\n\nZoom call tomorrow at 3pm https://zoom.us/j/123456789",
+    "Subject: Interview\n\nInterview scheduled for 2025-07-01. We will share the time later.",
+    "Subject: Re: lunch\n\nsounds good, see you at 1",
+]
+
+
+def legacy_contains_meeting(email_body, keywords=None):
+    """contains_meeting as it was before the classifier (minus the debug print)."""
+    meeting_words = [
+        r'\bmeeting\b', r'\bcall\b', r'\bappointment\b', r'\bconference\b', r'\bwebinar\b',
+        r'\bsession\b', r'\bdiscussion\b', r'\bsync\b', r'\bcatch up\b', r'\bstandup\b',
+        r'\breview\b', r'\binterview\b', r'\bzoom\b', r'\bteams\b', r'\bgoogle meet\b',
+        r'\bwebex\b', r'\bschedule\b', r'\binvite\b', r'\bmeet\b', r'\bmasterclass\b',
+        r'\bworkshop\b', r'\btraining\b', r'\bevent\b', r'\bclass\b', r'\bseminar\b'
+    ]
+    if keywords:
+        for kw in keywords:
+            meeting_words.append(r'\b' + re.escape(kw.strip()) + r'\b')
+    body_lower = email_body.lower()
+    has_meeting_word = any(re.search(word, body_lower) for word in meeting_words)
+    time_patterns = [
+        r'\b\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)\b',
+        r'\b\d{1,2}\s*(?:AM|PM|am|pm)\b',
+        r'\bat\s+\d{1,2}(?::\d{2})?\b',
+        r'\b(?:today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
+        r'\b\d{1,2}(?::\d{2})?\s*(?:IST|EST|PST|CST|UTC|GMT|EDT|PDT|CDT)\b'
+    ]
+    date_patterns = [
+        r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
+        r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?\b',
+        r'\b\d{1,2}(?:st|nd|rd|th)?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\b',
+        r'\b\d{4}-\d{1,2}-\d{1,2}\b',
+        r'\b(?:May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?\b'
+    ]
+    has_time_pattern = any(re.search(pattern, email_body, re.IGNORECASE) for pattern in time_patterns)
+    has_date_pattern = any(re.search(pattern, email_body, re.IGNORECASE) for pattern in date_patterns)
+    platform_words = [r'\bgmeet\b', r'\bgoogle meet\b', r'\bzoom\b', r'\bwebex\b',
+                      r'\bmicrosoft teams\b', r'\bmeet\.google\b', r'\bzoom\.us\b']
+    has_strong_platform = any(re.search(p, body_lower) for p in platform_words)
+    if has_strong_platform and has_time_pattern:
+        return True
+    return has_meeting_word and has_time_pattern and has_date_pattern
+
+
+def run(fn, bodies, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for body in bodies:
+            fn(body)
+    elapsed = time.perf_counter() - start
+    return rounds * len(bodies) / elapsed
+
+
+def main(rounds=200):
+    random.seed(0)
+    bodies = [random.choice(SAMPLES) for _ in range(500)]
+    classifier = get_classifier(tuple(KEYWORDS))
+
+    mismatches = [b for b in SAMPLES if legacy_contains_meeting(b, KEYWORDS) != classifier.classify(b)[0]]
+    if mismatches:
+        raise SystemExit(f"Classifier disagrees with legacy implementation on {len(mismatches)} sample(s)")
+
+    before = run(lambda b: legacy_contains_meeting(b, KEYWORDS), bodies, rounds)
+    after = run(lambda b: get_classifier(tuple(KEYWORDS)).classify(b), bodies, rounds)
+    print(f"legacy contains_meeting : {before:10.0f} emails/sec")
+    print(f"MeetingClassifier       : {after:10.0f} emails/sec  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
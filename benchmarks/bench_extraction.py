@@ -0,0 +1,160 @@
+"""Throughput, latency and accuracy of the meeting-extraction functions.
+
+Runs each function over the synthetic corpus (benchmarks/corpus.py) and
+reports emails/sec, p50/p99 per-email latency and accuracy against the
+corpus labels. Any labelled sample an extractor gets wrong is listed and
+makes the run exit non-zero, so a change to the extractors that breaks a
+labelled case fails on its own. Results, including every output, can be
+saved and two saved runs compared, e.g. before and after a change:
+
+    python -m benchmarks.bench_extraction --save before.json
+    git stash && python -m benchmarks.bench_extraction --save after.json && git stash pop
+    python -m benchmarks.bench_extraction --compare before.json after.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.corpus import generate
+from src.mail_processor import (contains_meeting, decode_body, extract_meeting_details,
+                                extract_meeting_link, extract_meeting_title)
+
+# Mismatches listed per function; the rest are only counted
+MAX_MISSES_SHOWN = 10
+
+KEYWORDS = ["meeting", "zoom", "conference", "appointment", "masterclass", "workshop", "meet", "gmeet", "google meet"]
+
+
+def _time_output(details):
+    value = details["time"]
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.replace(second=0, microsecond=0).isoformat()
+
+
+# name -> (call(sample), output normaliser, label key, is the output correct?)
+FUNCTIONS = {
+    "decode_body": (lambda s: decode_body(s["payload"]), lambda out: out[:200], "marker",
+                    lambda out, want: want in out),
+    "contains_meeting": (lambda s: contains_meeting(s["text"], KEYWORDS), bool, "is_meeting",
+                         lambda out, want: out == want),
+    "extract_meeting_details": (lambda s: extract_meeting_details(s["text"]), _time_output, "time",
+                                lambda out, want: out == want),
+    "extract_meeting_link": (lambda s: extract_meeting_link(s["text"]), lambda out: out, "link",
+                             lambda out, want: out == want),
+    "extract_meeting_title": (lambda s: extract_meeting_title(s["text"]), lambda out: out, "title",
+                              lambda out, want: out == want),
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench_function(name, corpus):
+    call, normalise, label, correct = FUNCTIONS[name]
+    latencies, outputs, misses = [], [], []
+    scored = 0
+    # Keep anything the extractors write to stdout out of both the timing and the report
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        for sample in corpus:
+            start = time.perf_counter()
+            out = call(sample)
+            latencies.append(time.perf_counter() - start)
+            out = normalise(out)
+            outputs.append(out)
+            want = sample["expected"].get(label)
+            if want is not None:
+                scored += 1
+                if not correct(out, want):
+                    misses.append({"sample": len(outputs) - 1, "expected": want, "got": out})
+            sink.seek(0)
+            sink.truncate()
+    total = sum(latencies)
+    return {
+        "emails_per_sec": len(corpus) / total if total else float("inf"),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "accuracy": (scored - len(misses)) / scored if scored else None,
+        "scored": scored,
+        "misses": misses,
+        "outputs": outputs,
+    }
+
+
+def run(size, seed, names):
+    corpus = generate(size, seed)
+    return {
+        "size": size,
+        "seed": seed,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "results": {name: bench_function(name, corpus) for name in names},
+    }
+
+
+def print_report(report):
+    print(f"{'function':26} {'emails/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'accuracy':>9}")
+    for name, r in report["results"].items():
+        acc = f"{r['accuracy'] * 100:8.1f}%" if r["accuracy"] is not None else "      n/a"
+        print(f"{name:26} {r['emails_per_sec']:10.0f} {r['p50_ms']:8.3f} {r['p99_ms']:8.3f} {acc}")
+    for name, r in report["results"].items():
+        for miss in r["misses"][:MAX_MISSES_SHOWN]:
+            print(f"MISMATCH {name} sample {miss['sample']}: expected {miss['expected']!r}, got {miss['got']!r}")
+        if len(r["misses"]) > MAX_MISSES_SHOWN:
+            print(f"MISMATCH {name}: {len(r['misses']) - MAX_MISSES_SHOWN} more")
+
+
+def compare(before_path, after_path):
+    """Print speed/accuracy deltas and count outputs that changed between two runs."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    if (before["size"], before["seed"]) != (after["size"], after["seed"]):
+        sys.exit("Runs used different corpora (size/seed); re-run with matching options")
+    changed_total = 0
+    print(f"{'function':26} {'speedup':>8} {'p99 before':>11} {'p99 after':>10} {'accuracy':>17} {'changed':>8}")
+    for name, b in before["results"].items():
+        a = after["results"].get(name)
+        if a is None:
+            continue
+        changed = sum(1 for x, y in zip(b["outputs"], a["outputs"]) if x != y)
+        changed_total += changed
+        acc = "n/a"
+        if b["accuracy"] is not None and a["accuracy"] is not None:
+            acc = f"{b['accuracy'] * 100:.1f}% -> {a['accuracy'] * 100:.1f}%"
+        print(f"{name:26} {a['emails_per_sec'] / b['emails_per_sec']:7.2f}x {b['p99_ms']:11.3f} "
+              f"{a['p99_ms']:10.3f} {acc:>17} {changed:8d}")
+    return changed_total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--only", action="append", choices=sorted(FUNCTIONS), help="benchmark only these functions")
+    parser.add_argument("--save", metavar="PATH", help="write the full results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two saved runs")
+    args = parser.parse_args(argv)
+    if args.compare:
+        changed = compare(*args.compare)
+        # Non-zero exit when outputs differ so this can gate a refactor
+        sys.exit(1 if changed else 0)
+    report = run(args.size, args.seed, args.only or list(FUNCTIONS))
+    print_report(report)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f)
+    # A labelled case that disagrees with its label is a regression, whatever the speed
+    sys.exit(1 if any(r["misses"] for r in report["results"].values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
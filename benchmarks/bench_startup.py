@@ -0,0 +1,140 @@
+"""Cold-start cost of the backend: import time and time to first response.
+
+Each round runs in a fresh interpreter. "import" is how long `import
+src.main` takes; "first response" is the wall time from launching the
+server until GET /api/health answers, which is what the Electron UI waits
+for. The server runs against a throwaway database. Also reports whether
+the Google client stack got imported eagerly, which it should not be.
+
+    python -m benchmarks.bench_startup --save before.json
+    python -m benchmarks.bench_startup --save after.json
+    python -m benchmarks.bench_startup --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules that should only load once a scan or OAuth flow needs them
+DEFERRED = ["googleapiclient.discovery", "google_auth_oauthlib", "google_auth_httplib2", "httplib2"]
+# A later run counts as a regression when it is this much slower
+TOLERANCE = 0.2
+
+IMPORT_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import src.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "eager": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED,)
+
+SERVER = """
+import sys, uvicorn
+import src.main as main
+from src.store import MeetingStore
+main.MeetingStore = lambda: MeetingStore(sys.argv[1])
+uvicorn.run(main.app, host="127.0.0.1", port=int(sys.argv[2]), log_level="warning")
+"""
+
+
+def measure_import():
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_first_response(timeout=30):
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/api/health"
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-c", SERVER, os.path.join(tmp, "meetings.db"), str(port)],
+                                cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while time.perf_counter() - start < timeout:
+                if proc.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                try:
+                    with urllib.request.urlopen(url, timeout=1):
+                        return time.perf_counter() - start
+                except urllib.error.HTTPError:
+                    # Any answer means the server is up (older trees have no /api/health)
+                    return time.perf_counter() - start
+                except OSError:
+                    time.sleep(0.01)
+            raise RuntimeError(f"no response within {timeout}s")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+def run(rounds):
+    imports = [measure_import() for _ in range(rounds)]
+    first = [measure_first_response() for _ in range(rounds)]
+    return {
+        "rounds": rounds,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "import_ms": statistics.median(r["seconds"] for r in imports) * 1000,
+        "first_response_ms": statistics.median(first) * 1000,
+        "eager_imports": sorted({m for r in imports for m in r["eager"]}),
+    }
+
+
+def print_report(report):
+    print(f"import src.main      {report['import_ms']:8.1f} ms (median of {report['rounds']})")
+    print(f"first response       {report['first_response_ms']:8.1f} ms")
+    print(f"eager Google imports {', '.join(report['eager_imports']) or 'none'}")
+
+
+def compare(before_path, after_path):
+    """Print the change between two saved runs; returns True if anything regressed."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    regressed = False
+    for key in ("import_ms", "first_response_ms"):
+        ratio = after[key] / before[key]
+        slower = ratio > 1 + TOLERANCE
+        regressed |= slower
+        print(f"{key:18} {before[key]:8.1f} -> {after[key]:8.1f} ms  {ratio:5.2f}x{'  REGRESSION' if slower else ''}")
+    new_eager = sorted(set(after["eager_imports"]) - set(before["eager_imports"]))
+    if new_eager:
+        regressed = True
+        print(f"newly eager imports: {', '.join(new_eager)}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two saved runs")
+    args = parser.parse_args(argv)
+    if args.compare:
+        # Non-zero exit on a regression so this can gate a change
+        sys.exit(1 if compare(*args.compare) else 0)
+    report = run(args.rounds)
+    print_report(report)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Synthetic, labelled email corpus for the meeting-extraction benchmarks.
+
+Every sample is a dict with the Gmail-API-shaped `payload`, the `subject`,
+the `text` the monitor would hand to the extractors ("Subject: ...\\n\\nbody")
+and an `expected` dict of labels. A label of None means "not scored" (used
+for adversarial bodies that only exist to stress timing).
+
+    python -m benchmarks.corpus --size 500 > corpus.json
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+PLATFORMS = [
+    ("Zoom", "https://zoom.us/j/{n}"),
+    ("Google Meet", "https://meet.google.com/{a}-{b}-{c}"),
+    ("Microsoft Teams", "https://teams.microsoft.com/l/meetup-join/19%3ameeting_{n}%40thread.v2/0"),
+    ("Webex", "https://acme.webex.com/acme/j.php?MTID=m{n}"),
+]
+
+TOPICS = ["Quarterly planning", "Design review", "Python masterclass", "Onboarding workshop",
+          "Sprint retro", "Customer interview", "Data science webinar", "Team sync"]
+
+NEWSLETTER_LINES = [
+    "Top stories this week, curated for you.",
+    "Our biggest sale of the season ends soon — don't miss out!",
+    "Read the latest updates from the product team.",
+    "You are receiving this because you subscribed to our list.",
+    "Unsubscribe at any time from your account settings.",
+    "Shipping is free on orders over $50.",
+]
+
+
+def _b64(text):
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")
+
+
+def _part(mime_type, text):
+    return {"mimeType": mime_type, "headers": [], "body": {"data": _b64(text), "size": len(text)}}
+
+
+def _headers(sender, subject):
+    return [{"name": "From", "value": sender}, {"name": "Subject", "value": subject}]
+
+
+def _time_str(dt, rng):
+    hour = dt.hour % 12 or 12
+    suffix = "pm" if dt.hour >= 12 else "am"
+    if dt.minute or rng.random() < 0.5:
+        return f"{hour}:{dt.minute:02d} {suffix.upper() if rng.random() < 0.5 else suffix}"
+    return f"{hour}{suffix}"
+
+
+def _date_str(dt, rng):
+    style = rng.randrange(3)
+    if style == 0:
+        return dt.strftime("%d-%m-%Y")
+    if style == 1:
+        return dt.strftime("%B ") + str(dt.day) + ", " + str(dt.year)
+    return f"{dt.day} {dt.strftime('%b')} {dt.year}"
+
+
+def _link(rng):
+    name, template = rng.choice(PLATFORMS)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    link = template.format(
+        n=rng.randrange(10**9, 10**10),
+        a="".join(rng.choice(letters) for _ in range(3)),
+        b="".join(rng.choice(letters) for _ in range(4)),
+        c="".join(rng.choice(letters) for _ in range(3)),
+    )
+    return name, link
+
+
+def _sample(kind, subject, body, payload, expected):
+    return {
+        "kind": kind,
+        "subject": subject,
+        "text": f"Subject: {subject}\n\n{body}" if subject else body,
+        "payload": payload,
+        "expected": expected,
+    }
+
+
+def make_invite(rng, base):
+    start = (base + timedelta(days=rng.randrange(1, 60))).replace(
+        hour=rng.randrange(8, 19), minute=rng.choice([0, 0, 15, 30, 45]))
+    topic = rng.choice(TOPICS)
+    platform, link = _link(rng)
+    when_t, when_d = _time_str(start, rng), _date_str(start, rng)
+    style = rng.randrange(3)
+    if style == 0:
+        body = f"Hi all,\n\nJoin the {platform} meeting at {when_t} {when_d}.\n{link}\n\nThanks"
+    elif style == 1:
+        body = f"You're invited to {topic}.\n\nDate: {when_d}\nTime: {when_t}\n\nJoin: {link}"
+    else:
+        body = f"Reminder: {topic} on {when_d} at {when_t} over {platform}.\nJoin here {link}"
+    subject = topic
+    payload = {"mimeType": "text/plain", "headers": _headers("host@example.com", subject), "body": {"data": _b64(body)}}
+    return _sample("invite", subject, body, payload, {
+        "is_meeting": True,
+        "time": start.replace(second=0, microsecond=0).isoformat(),
+        "link": link,
+        "title": subject,
+        "marker": link,
+    })
+
+
+def make_newsletter(rng, base):
+    lines = [rng.choice(NEWSLETTER_LINES) for _ in range(rng.randrange(5, 40))]
+    if rng.random() < 0.5:
+        lines.insert(2, f"Offer valid until {_date_str(base + timedelta(days=7), rng)}.")
+    body = "\n".join(lines)
+    subject = rng.choice(["This week's digest", "Flash sale", "Your monthly update"])
+    payload = {"mimeType": "multipart/alternative", "headers": _headers("news@shop.example", subject), "parts": [
+        _part("text/plain", body),
+        _part("text/html", f"<html><body><p>{'</p><p>'.join(lines)}</p></body></html>"),
+    ]}
+    return _sample("newsletter", subject, body, payload, {
+        "is_meeting": False, "time": None, "link": None, "title": None, "marker": lines[0],
+    })
+
+
+def make_multipart_invite(rng, base):
+    sample = make_invite(rng, base)
+    body = sample["text"].split("\n\n", 1)[1]
+    html = "<html><body>" + "".join(f"<p>{line}</p>" for line in body.splitlines()) + "</body></html>"
+    start = datetime.fromisoformat(sample["expected"]["time"])
+    ics = ("BEGIN:VCALENDAR\r\nMETHOD:REQUEST\r\nBEGIN:VEVENT\r\n"
+           f"UID:{rng.randrange(10**12)}@example.com\r\nSUMMARY:{sample['subject']}\r\n"
+           f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n")
+    # Nest the text parts one level down, the way Gmail and Outlook send invites
+    sample["payload"] = {"mimeType": "multipart/mixed", "headers": sample["payload"]["headers"], "parts": [
+        {"mimeType": "multipart/alternative", "headers": [], "body": {"size": 0}, "parts": [
+            _part("text/plain", body), _part("text/html", html), _part("text/calendar", ics),
+        ]},
+    ]}
+    sample["kind"] = "multipart"
+    return sample
+
+
+def make_adversarial(rng, base):
+    filler = rng.choice([
+        "Date: " + "1" * 50 + "\n",
+        "meeting " * 20 + "\n",
+        "12/12/12 " * 30 + "\n",
+        "https://example.com/" + "join" * 40 + "\n",
+        "a" * 500 + "\n",
+    ])
+    body = filler * rng.randrange(200, 400)
+    subject = "Re: re: fwd: notes"
+    payload = {"mimeType": "text/plain", "headers": _headers("noise@example.com", subject), "body": {"data": _b64(body)}}
+    return _sample("adversarial", subject, body, payload, {
+        "is_meeting": None, "time": None, "link": None, "title": None, "marker": None,
+    })
+
+
+GENERATORS = [(make_invite, 4), (make_multipart_invite, 2), (make_newsletter, 3), (make_adversarial, 1)]
+
+
+def generate(size=500, seed=1234, base=None):
+    """Deterministic corpus of `size` samples mixing invites, newsletters and noise."""
+    rng = random.Random(seed)
+    base = base or datetime(2026, 1, 5, 9, 0)
+    makers = [fn for fn, weight in GENERATORS for _ in range(weight)]
+    return [rng.choice(makers)(rng, base) for _ in range(size)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+    json.dump(generate(args.size, args.seed), sys.stdout, indent=1)
@@ -1,11 +1,13 @@
 import os
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
 
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CREDENTIALS_PATH = os.path.join(BASE_DIR, "credentials.json")
+# Refresh access tokens this long before they lapse, so a scan never starts on an expiring token
+REFRESH_MARGIN = timedelta(minutes=5)
 
 # In-memory store for pending OAuth flows (keyed by state/email)
 _pending_flows = {}
@@ -19,13 +21,18 @@ def get_token_files():
             files.append(os.path.join(parent, f))
     return files
 
-def get_authorization_url(redirect_uri, email=None):
-    """Generate an OAuth authorization URL and persist the flow for callback use."""
-    flow = Flow.from_client_secrets_file(
+def _new_flow(redirect_uri):
+    # google_auth_oauthlib is slow to import and only needed while adding an account
+    from google_auth_oauthlib.flow import Flow
+    return Flow.from_client_secrets_file(
         CREDENTIALS_PATH,
         scopes=SCOPES,
         redirect_uri=redirect_uri
     )
+
+def get_authorization_url(redirect_uri, email=None):
+    """Generate an OAuth authorization URL and persist the flow for callback use."""
+    flow = _new_flow(redirect_uri)
     state = email or "default"
     auth_url, _ = flow.authorization_url(
         access_type='offline',
@@ -42,31 +49,96 @@ def exchange_code(code, redirect_uri, state, token_path):
     flow = _pending_flows.pop(state, None)
     if flow is None:
         # Fallback: create a fresh flow (PKCE won't match, but worth trying)
-        flow = Flow.from_client_secrets_file(
-            CREDENTIALS_PATH,
-            scopes=SCOPES,
-            redirect_uri=redirect_uri
-        )
+        flow = _new_flow(redirect_uri)
     else:
         # Update redirect_uri in case it changed
         flow.redirect_uri = redirect_uri
 
     flow.fetch_token(code=code)
     creds = flow.credentials
-    with open(token_path, 'w') as f:
-        f.write(creds.to_json())
+    credentials.put(token_path, creds)
     return creds
 
+def write_token(token_path, creds):
+    """Write a token file atomically so a crash or concurrent reader never sees half a file."""
+    fd, tmp_path = tempfile.mkstemp(prefix=".token-", suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(token_path)))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(creds.to_json())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, token_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+class CredentialManager:
+    """In-process cache of OAuth credentials, one entry per token file.
+
+    get() refreshes a token REFRESH_MARGIN ahead of expiry and writes it back.
+    Each token file has its own lock, so concurrent callers for one account
+    share a single refresh while other accounts are never blocked.
+    """
+
+    def __init__(self, refresh_margin=REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._creds = {}
+        self._request = None
+
+    def _lock_for(self, token_path):
+        with self._lock:
+            return self._locks.setdefault(token_path, threading.Lock())
+
+    def _expiring(self, creds):
+        if not creds.token:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.expiry - self.refresh_margin <= now
+
+    def get(self, token_path):
+        """Valid credentials for a token file, or None if it is missing or can't be refreshed."""
+        with self._lock_for(token_path):
+            if not os.path.exists(token_path):
+                # Removed account: drop whatever we had cached
+                self._creds.pop(token_path, None)
+                return None
+            creds = self._creds.get(token_path)
+            if creds is None:
+                from google.oauth2.credentials import Credentials
+                creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+            if self._expiring(creds):
+                if creds.refresh_token:
+                    if self._request is None:
+                        from google.auth.transport.requests import Request
+                        self._request = Request()
+                    creds.refresh(self._request)
+                    self.refreshes += 1
+                    write_token(token_path, creds)
+                elif not creds.valid:
+                    self._creds.pop(token_path, None)
+                    return None
+            self._creds[token_path] = creds
+            return creds
+
+    def put(self, token_path, creds):
+        """Persist freshly issued credentials and cache them."""
+        with self._lock_for(token_path):
+            write_token(token_path, creds)
+            self._creds[token_path] = creds
+
+    def forget(self, token_path):
+        with self._lock_for(token_path):
+            self._creds.pop(token_path, None)
+
+credentials = CredentialManager()
+
 def authenticate(token_path):
-    """Load and refresh credentials from a saved token file."""
-    if not os.path.exists(token_path):
-        return None
-    creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            with open(token_path, 'w') as f:
-                f.write(creds.to_json())
-        else:
-            return None
-    return creds
+    """Load and refresh credentials from a saved token file (cached per process)."""
+    return credentials.get(token_path)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import threading
+from collections import deque
+
+
+class EventBus:
+    """Fans server events out to Server-Sent Events clients.
+
+    publish() is safe to call from any thread. The last `history` events are
+    kept so a reconnecting client can resume from its Last-Event-ID; if it
+    has fallen further behind it gets a `resync` event and should refetch.
+    """
+
+    def __init__(self, history=500, client_queue_size=1000, keepalive=15):
+        self.client_queue_size = client_queue_size
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=history)
+        self._last_id = 0
+        self._subscribers = {}
+
+    def publish(self, event_type, data):
+        with self._lock:
+            self._last_id += 1
+            event = (self._last_id, event_type, data)
+            self._buffer.append(event)
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The client's event loop has shut down
+                self._subscribers.pop(queue, None)
+        return event[0]
+
+    def client_count(self):
+        return len(self._subscribers)
+
+    def _deliver(self, queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: disconnect it, the browser resumes via Last-Event-ID
+            self._subscribers.pop(queue, None)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def _subscribe(self, last_event_id):
+        queue = asyncio.Queue(maxsize=self.client_queue_size)
+        with self._lock:
+            backlog = []
+            if last_event_id is not None:
+                oldest = self._buffer[0][0] if self._buffer else self._last_id + 1
+                # Too far behind, or an ID from before a server restart
+                if last_event_id + 1 < oldest or last_event_id > self._last_id:
+                    backlog.append((self._last_id, "resync", {}))
+                else:
+                    backlog.extend(e for e in self._buffer if e[0] > last_event_id)
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue, backlog
+
+    async def stream(self, last_event_id=None, is_disconnected=None):
+        """Async generator of SSE-formatted strings for one client."""
+        queue, backlog = self._subscribe(last_event_id)
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                yield format_event(event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    if is_disconnected and await is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield format_event(event)
+        finally:
+            with self._lock:
+                self._subscribers.pop(queue, None)
+
+
+def format_event(event):
+    event_id, event_type, data = event
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def parse_last_event_id(value):
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,213 @@
+"""In-memory stand-in for the Gmail API service, for exercising the monitor offline."""
+import base64
+import time
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+def _http_error(status, message):
+    return HttpError(httplib2.Response({'status': status}), message.encode())
+
+
+def _encode(text):
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii')
+
+
+class _Call:
+    """Mimics a googleapiclient HttpRequest: the work happens on execute()."""
+
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class FakeGmailService:
+    """Tiny Gmail fake supporting getProfile, watch, messages.list/get, history.list and batches.
+
+    Search queries are not evaluated: messages.list returns every message,
+    newest first, which matches what the monitor sees with a broad query.
+    Once watch() has been called, every delivered message is announced to
+    the `subscribers` callables as (email_address, history_id), the way Gmail
+    publishes to a Pub/Sub topic (see src.fake_pubsub).
+    """
+
+    def __init__(self, email_address="me@example.com"):
+        self.email_address = email_address
+        self.store = {}
+        self.order = []
+        self.records = []
+        self.history_id = 1000
+        self.min_history_id = 1000
+        self.calls = []
+        self.failures = []
+        self.watch_topic = None
+        self.subscribers = []
+
+    # --- test helpers -------------------------------------------------
+    def add_message(self, sender, subject, body, mime_type='text/plain', msg_id=None, headers=None):
+        """Deliver a message and record a messageAdded history entry for it."""
+        msg_id = msg_id or f"msg{len(self.order) + 1:05d}"
+        all_headers = [{'name': 'From', 'value': sender}, {'name': 'Subject', 'value': subject}]
+        for name, value in (headers or {}).items():
+            all_headers.append({'name': name, 'value': value})
+        payload = {
+            'mimeType': 'multipart/alternative',
+            'headers': all_headers,
+            'body': {'size': 0},
+            'parts': [{'mimeType': mime_type, 'headers': [], 'body': {'data': _encode(body), 'size': len(body)}}],
+        }
+        self.history_id += 1
+        self.store[msg_id] = {
+            'id': msg_id,
+            'threadId': msg_id,
+            'labelIds': ['INBOX'],
+            'snippet': body[:200],
+            'historyId': str(self.history_id),
+            'payload': payload,
+        }
+        self.order.insert(0, msg_id)
+        self.records.append({'id': str(self.history_id), 'messagesAdded': [{'message': {'id': msg_id, 'labelIds': ['INBOX']}}]})
+        if self.watch_topic:
+            for subscriber in self.subscribers:
+                subscriber(self.email_address, self.history_id)
+        return msg_id
+
+    def expire_history(self):
+        """Drop all stored history so older startHistoryIds get a 404."""
+        self.records = []
+        self.min_history_id = self.history_id
+
+    def fail_next(self, status, count=1, message='Rate Limit Exceeded'):
+        """Make the next `count` list calls fail with an HTTP error."""
+        self.failures.extend([(status, message)] * count)
+
+    def _maybe_fail(self):
+        if self.failures:
+            status, message = self.failures.pop(0)
+            raise _http_error(status, message)
+
+    # --- Gmail API surface --------------------------------------------
+    def users(self):
+        return self
+
+    def getProfile(self, userId='me'):
+        self.calls.append('getProfile')
+        return _Call(lambda: {
+            'emailAddress': self.email_address,
+            'messagesTotal': len(self.store),
+            'historyId': str(self.history_id),
+        })
+
+    def watch(self, userId='me', body=None):
+        self.calls.append('watch')
+
+        def run():
+            self.watch_topic = (body or {}).get('topicName')
+            if not self.watch_topic:
+                raise _http_error(400, 'Invalid topicName')
+            return {'historyId': str(self.history_id), 'expiration': str(int((time.time() + 7 * 86400) * 1000))}
+        return _Call(run)
+
+    def stop(self, userId='me'):
+        self.calls.append('stop')
+
+        def run():
+            self.watch_topic = None
+            return {}
+        return _Call(run)
+
+    def history(self):
+        return _FakeHistory(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _FakeBatch(self, callback)
+
+    def messages(self):
+        return _FakeMessages(self)
+
+
+class _FakeBatch:
+    """Runs the queued calls on execute(), reporting each through the callback."""
+
+    def __init__(self, svc, callback):
+        self.svc = svc
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request, callback or self.callback))
+
+    def execute(self):
+        self.svc.calls.append('batch')
+        for request_id, request, callback in self.requests:
+            try:
+                response, exception = request.execute(), None
+            except HttpError as e:
+                response, exception = None, e
+            if callback:
+                callback(request_id, response, exception)
+
+
+class _FakeHistory:
+    def __init__(self, svc):
+        self.svc = svc
+
+    def list(self, userId='me', startHistoryId=None, historyTypes=None, pageToken=None, maxResults=100):
+        svc = self.svc
+        svc.calls.append('history.list')
+
+        def run():
+            svc._maybe_fail()
+            start = int(startHistoryId)
+            if start < svc.min_history_id:
+                raise _http_error(404, 'Requested entity was not found.')
+            records = [h for h in svc.records if int(h['id']) > start]
+            offset = int(pageToken or 0)
+            page = records[offset:offset + maxResults]
+            resp = {'historyId': str(svc.history_id)}
+            if page:
+                resp['history'] = page
+            if offset + maxResults < len(records):
+                resp['nextPageToken'] = str(offset + maxResults)
+            return resp
+        return _Call(run)
+
+
+class _FakeMessages:
+    def __init__(self, svc):
+        self.svc = svc
+
+    def list(self, userId='me', q=None, maxResults=100, pageToken=None):
+        svc = self.svc
+        svc.calls.append('messages.list')
+
+        def run():
+            svc._maybe_fail()
+            offset = int(pageToken or 0)
+            page = svc.order[offset:offset + maxResults]
+            resp = {'resultSizeEstimate': len(page)}
+            if page:
+                resp['messages'] = [{'id': i, 'threadId': svc.store[i]['threadId']} for i in page]
+            if offset + maxResults < len(svc.order):
+                resp['nextPageToken'] = str(offset + maxResults)
+            return resp
+        return _Call(run)
+
+    def get(self, userId='me', id=None, format='full', metadataHeaders=None):
+        svc = self.svc
+        svc.calls.append(f'messages.get:{format}')
+
+        def run():
+            if id not in svc.store:
+                raise _http_error(404, 'Requested entity was not found.')
+            msg = svc.store[id]
+            if format != 'metadata':
+                return msg
+            wanted = {h.lower() for h in (metadataHeaders or [])}
+            headers = [h for h in msg['payload']['headers'] if not wanted or h['name'].lower() in wanted]
+            result = {k: v for k, v in msg.items() if k != 'payload'}
+            result['payload'] = {'mimeType': msg['payload']['mimeType'], 'headers': headers}
+            return result
+        return _Call(run)
@@ -0,0 +1,105 @@
+"""Local stand-in for the Pub/Sub push subscription behind Gmail watch().
+
+Gmail publishes {"emailAddress", "historyId"} to a Cloud Pub/Sub topic and a
+push subscription POSTs it to /api/gmail/push wrapped in a Pub/Sub envelope.
+FakePublisher produces the same envelopes, so push mode can be exercised
+without Google Cloud:
+
+    python -m src.fake_pubsub me@example.com 12345
+    python -m src.fake_pubsub me@example.com 12345 --endpoint http://localhost:5000/api/gmail/push --token s3cret
+
+Attach it to a FakeGmailService and every add_message() is announced, the
+way Gmail announces new mail once an account is watched.
+"""
+import argparse
+import base64
+import itertools
+import json
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+
+DEFAULT_ENDPOINT = "http://localhost:5000/api/gmail/push"
+DEFAULT_SUBSCRIPTION = "projects/local/subscriptions/gmail-push"
+
+_message_ids = itertools.count(1)
+
+
+def envelope(email_address, history_id, subscription=DEFAULT_SUBSCRIPTION):
+    """The JSON body a Pub/Sub push subscription sends for one Gmail notification."""
+    data = json.dumps({"emailAddress": email_address, "historyId": int(history_id)})
+    message_id = str(next(_message_ids))
+    return {
+        "message": {
+            "data": base64.b64encode(data.encode()).decode("ascii"),
+            "messageId": message_id,
+            "message_id": message_id,
+            "publishTime": datetime.now(timezone.utc).isoformat(),
+        },
+        "subscription": subscription,
+    }
+
+
+def http_post(url, body):
+    """POST a JSON body; returns the response status."""
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method="POST",
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.status
+
+
+class FakePublisher:
+    """Delivers Gmail notifications to a push endpoint like a Pub/Sub subscription.
+
+    `post(url, body)` does the delivery and returns the HTTP status; it
+    defaults to a real HTTP POST, and tests can pass e.g. a TestClient
+    wrapper. Pub/Sub treats any non-2xx answer as a nack, so those are kept
+    in `failed` for the caller to inspect or redeliver().
+    """
+
+    def __init__(self, endpoint=DEFAULT_ENDPOINT, token=None, post=None, subscription=DEFAULT_SUBSCRIPTION):
+        if token:
+            endpoint += ("&" if "?" in endpoint else "?") + urllib.parse.urlencode({"token": token})
+        self.endpoint = endpoint
+        self.post = post or http_post
+        self.subscription = subscription
+        self.delivered = 0
+        self.failed = []
+
+    def attach(self, service):
+        """Publish every message delivered to a (watched) FakeGmailService."""
+        service.subscribers.append(self.publish)
+        return self
+
+    def publish(self, email_address, history_id):
+        body = envelope(email_address, history_id, self.subscription)
+        return self._deliver(body)
+
+    def redeliver(self):
+        """Retry nacked deliveries once; returns how many were accepted."""
+        pending, self.failed = self.failed, []
+        return sum(self._deliver(body) for body in pending)
+
+    def _deliver(self, body):
+        try:
+            status = self.post(self.endpoint, body)
+        except Exception:
+            status = None
+        if status is None or not 200 <= status < 300:
+            self.failed.append(body)
+            return False
+        self.delivered += 1
+        return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send one Gmail push notification to a local endpoint")
+    parser.add_argument("email", help="account the notification is for")
+    parser.add_argument("history_id", type=int, help="mailbox history ID after the change")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT)
+    parser.add_argument("--token", help="shared secret configured as pushToken")
+    args = parser.parse_args()
+    publisher = FakePublisher(args.endpoint, token=args.token)
+    ok = publisher.publish(args.email, args.history_id)
+    print("delivered" if ok else "rejected")
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,229 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# The Google client stack (googleapiclient, httplib2, google-auth) takes a
+# quarter of a second to import, so it is imported where it is first used
+# instead of delaying server startup; warm_up() loads it ahead of time.
+
+logger = logging.getLogger(__name__)
+
+# Gmail accepts up to 100 calls per batch but starts rate limiting well before that
+BATCH_SIZE = 50
+HTTP_TIMEOUT = 60
+# messages.list page size (Gmail's maximum) and the most IDs one full sync query collects
+LIST_PAGE_SIZE = 500
+MAX_SYNC_MESSAGES = 5000
+# Split search queries run side by side, each on its own thread-local connection
+MAX_PARALLEL_QUERIES = 4
+# Gmail API quota units per call (https://developers.google.com/gmail/api/reference/quota)
+QUOTA_UNITS = {"messages.list": 5, "history.list": 2, "messages.get": 5, "users.watch": 100}
+# history.list reports every added message; messages.list leaves these out by default
+SKIPPED_LABELS = {"DRAFT", "SPAM", "TRASH"}
+# Errors that mean "slow down" rather than "this account is broken"
+RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+
+def is_rate_limited(error):
+    """True for Gmail 429/5xx responses and 403 rate-limit errors."""
+    from googleapiclient.errors import HttpError
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status == 429 or status >= 500:
+        return True
+    return status == 403 and any(reason in str(error) for reason in RATE_LIMIT_REASONS)
+
+
+class ThreadLocalHttp:
+    """httplib2.Http stand-in that keeps one keep-alive connection pool per thread.
+
+    httplib2.Http isn't thread-safe, so it can't be shared outright; one per
+    scan thread means every account reuses the same few sockets instead of
+    each opening its own.
+    """
+
+    def __init__(self, timeout=HTTP_TIMEOUT):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import httplib2
+            http = self._local.http = httplib2.Http(timeout=self.timeout)
+        return http
+
+    def request(self, *args, **kwargs):
+        return self._http().request(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._http(), name)
+
+
+_transport = ThreadLocalHttp()
+_build_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _discovery_document():
+    from googleapiclient.discovery_cache import get_static_doc
+    content = get_static_doc("gmail", "v1")
+    return json.loads(content) if content else None
+
+
+def build_service(credentials):
+    """Gmail client for one account on the shared discovery document and transport.
+
+    The discovery JSON is parsed once per process, so each extra account costs
+    a few microseconds rather than a fresh parse and its own HTTP connection.
+    """
+    import google_auth_httplib2
+    from googleapiclient.discovery import build, build_from_document
+    http = google_auth_httplib2.AuthorizedHttp(credentials, http=_transport)
+    document = _discovery_document()
+    if document is None:
+        return build("gmail", "v1", http=http)
+    # build_from_document normalises the parsed document in place, so serialise it
+    with _build_lock:
+        return build_from_document(document, http=http)
+
+
+def warm_up():
+    """Import the Google client stack and parse the discovery document before the first scan needs them."""
+    import google_auth_httplib2
+    import google.auth.transport.requests
+    import google.oauth2.credentials
+    import googleapiclient.discovery
+    _discovery_document()
+
+
+class HistoryExpired(Exception):
+    """Raised when Gmail no longer holds history for the requested startHistoryId."""
+
+
+def list_messages(service, query, max_messages=MAX_SYNC_MESSAGES):
+    """All message IDs matching one search query, following nextPageToken."""
+    ids = []
+    page_token = None
+    while len(ids) < max_messages:
+        kwargs = {'userId': 'me', 'q': query, 'maxResults': min(LIST_PAGE_SIZE, max_messages - len(ids))}
+        if page_token:
+            kwargs['pageToken'] = page_token
+        resp = service.users().messages().list(**kwargs).execute()
+        ids.extend(m['id'] for m in resp.get('messages', []))
+        page_token = resp.get('nextPageToken')
+        if not page_token:
+            break
+    else:
+        logger.warning("Search %r matched more than %d messages; older ones were skipped", query, max_messages)
+    return ids
+
+
+def full_sync(service, queries, max_messages=MAX_SYNC_MESSAGES):
+    """Run the search queries and return (message_ids, history_id) to resume from.
+
+    Several queries (see src.query_planner) run concurrently and their IDs
+    are merged in query order without duplicates.
+    """
+    if isinstance(queries, str):
+        queries = [queries]
+    # Read the history ID before listing so nothing that arrives in between is lost;
+    # anything listed twice is filtered later by the processed-ID check.
+    profile = service.users().getProfile(userId='me').execute()
+    history_id = profile.get('historyId')
+    if len(queries) == 1:
+        results = [list_messages(service, queries[0], max_messages)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(queries), MAX_PARALLEL_QUERIES)) as pool:
+            results = list(pool.map(lambda q: list_messages(service, q, max_messages), queries))
+    return list(dict.fromkeys(msg_id for ids in results for msg_id in ids)), history_id
+
+
+def incremental_sync(service, start_history_id):
+    """Return (message_ids, history_id) for messages added since start_history_id."""
+    from googleapiclient.errors import HttpError
+    ids = []
+    seen = set()
+    latest = start_history_id
+    page_token = None
+    while True:
+        kwargs = {'userId': 'me', 'startHistoryId': start_history_id, 'historyTypes': ['messageAdded']}
+        if page_token:
+            kwargs['pageToken'] = page_token
+        try:
+            resp = service.users().history().list(**kwargs).execute()
+        except HttpError as e:
+            # Gmail answers 404 once the start ID falls outside its history window
+            if e.resp.status == 404:
+                raise HistoryExpired(start_history_id) from e
+            raise
+        for record in resp.get('history', []):
+            for added in record.get('messagesAdded', []):
+                msg = added.get('message', {})
+                if SKIPPED_LABELS.intersection(msg.get('labelIds', [])) or msg.get('id') in seen:
+                    continue
+                seen.add(msg['id'])
+                ids.append(msg['id'])
+        latest = resp.get('historyId', latest)
+        page_token = resp.get('nextPageToken')
+        if not page_token:
+            break
+    return ids, latest
+
+
+def sync_messages(service, queries, history_id=None):
+    """Fetch candidate message IDs, incrementally when a history ID is known.
+
+    Returns (message_ids, history_id, searched). Without a usable history ID
+    this falls back to a full resync through the search queries; `searched`
+    tells the caller whether Gmail already applied the keyword query to the IDs.
+    """
+    if history_id:
+        try:
+            return incremental_sync(service, history_id) + (False,)
+        except HistoryExpired:
+            logger.info("History ID %s expired, running full resync", history_id)
+    return full_sync(service, queries) + (True,)
+
+
+def batch_get(service, message_ids, format='full', metadata_headers=None):
+    """Fetch many messages through Gmail batch requests, returning {id: message}.
+
+    Messages deleted since they were listed (404) are left out. Any other
+    per-message failure is raised once the batch finishes so the scan retries.
+    """
+    from googleapiclient.errors import HttpError
+    results = {}
+    errors = []
+
+    def callback(request_id, response, exception):
+        if exception is None:
+            results[request_id] = response
+        elif not (isinstance(exception, HttpError) and exception.resp.status == 404):
+            errors.append(exception)
+
+    for start in range(0, len(message_ids), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=callback)
+        for msg_id in message_ids[start:start + BATCH_SIZE]:
+            kwargs = {'userId': 'me', 'id': msg_id, 'format': format}
+            if metadata_headers:
+                kwargs['metadataHeaders'] = metadata_headers
+            batch.add(service.users().messages().get(**kwargs), request_id=msg_id)
+        batch.execute()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def watch(service, topic_name, label_ids=('INBOX',)):
+    """Ask Gmail to publish mailbox changes to a Pub/Sub topic.
+
+    Returns {historyId, expiration}; expiration is in epoch milliseconds and
+    the watch has to be renewed before then (Gmail allows at most 7 days).
+    Calling it again for the same topic just extends the existing watch.
+    """
+    body = {'topicName': topic_name, 'labelIds': list(label_ids), 'labelFilterBehavior': 'INCLUDE'}
+    return service.users().watch(userId='me', body=body).execute()
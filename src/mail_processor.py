@@ -1,11 +1,19 @@
 import base64
+import codecs
+import logging
 import re
+from html import unescape
+from collections import namedtuple
+from functools import lru_cache
 from dateutil.parser import parse
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import platform
 import os
 import webbrowser
 
+logger = logging.getLogger(__name__)
+
 TIMEZONE_MAP = {
     'IST': 'Asia/Kolkata',
     'EST': 'America/New_York',
@@ -18,67 +26,234 @@ TIMEZONE_MAP = {
     'CDT': 'America/Chicago'
 }
 
-def decode_body(payload):
-    """Decode email body from base64"""
-    if 'parts' in payload:
-        for part in payload['parts']:
-            if part['mimeType'] == 'text/plain':
-                data = part['body'].get('data', '')
-                if data:
-                    return base64.urlsafe_b64decode(data).decode('utf-8', errors='replace')
-    body_data = payload.get('body', {}).get('data', '')
-    if body_data:
-        return base64.urlsafe_b64decode(body_data).decode('utf-8', errors='replace')
-    return ""
+# Optional zone abbreviation after a time, limited to the ones TIMEZONE_MAP resolves
+TIMEZONE_SUFFIX_RE = r'(?:\s*\(?(?:' + '|'.join(TIMEZONE_MAP) + r')\b\)?)?'
 
-def contains_meeting(email_body, keywords=None):
-    """Meeting detection with rule-based patterns"""
-    meeting_words = [
-        r'\bmeeting\b', r'\bcall\b', r'\bappointment\b', r'\bconference\b', r'\bwebinar\b',
-        r'\bsession\b', r'\bdiscussion\b', r'\bsync\b', r'\bcatch up\b', r'\bstandup\b',
-        r'\breview\b', r'\binterview\b', r'\bzoom\b', r'\bteams\b', r'\bgoogle meet\b',
-        r'\bwebex\b', r'\bschedule\b', r'\binvite\b', r'\bmeet\b', r'\bmasterclass\b',
-        r'\bworkshop\b', r'\btraining\b', r'\bevent\b', r'\bclass\b', r'\bseminar\b'
-    ]
+# Normalized datetime strings remembered per day (fuzzy parses fill gaps from today's date)
+DATETIME_CACHE_SIZE = 4096
 
-    if keywords:
-        for kw in keywords:
-            meeting_words.append(r'\b' + re.escape(kw.strip()) + r'\b')
+@lru_cache(maxsize=None)
+def get_zone(name):
+    """Cached ZoneInfo for an IANA name (or TIMEZONE_MAP abbreviation); None if unknown"""
+    try:
+        return ZoneInfo(TIMEZONE_MAP.get(name, name))
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
 
-    body_lower = email_body.lower()
-    has_meeting_word = any(re.search(word, body_lower) for word in meeting_words)
+def resolve_tz(tzname, tzoffset):
+    """dateutil `tzinfos` callable: map known abbreviations to real zones, keep explicit offsets"""
+    zone = get_zone(tzname) if tzname in TIMEZONE_MAP else None
+    if zone is not None:
+        return zone
+    if tzoffset is not None:
+        return timezone(timedelta(seconds=tzoffset), tzname) if tzname else timezone(timedelta(seconds=tzoffset))
+    return None
 
-    time_patterns = [
-        r'\b\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)\b',
-        r'\b\d{1,2}\s*(?:AM|PM|am|pm)\b',
-        r'\bat\s+\d{1,2}(?::\d{2})?\b',
-        r'\b(?:today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
-        r'\b\d{1,2}(?::\d{2})?\s*(?:IST|EST|PST|CST|UTC|GMT|EDT|PDT|CDT)\b'
-    ]
+def _parse_datetime(text, today):
+    try:
+        dt = parse(text, fuzzy=True, dayfirst=True, tzinfos=resolve_tz, default=datetime.combine(today, time()))
+    except (ValueError, OverflowError):
+        return None
+    # No zone in the text means the local zone, as before
+    return dt if dt.tzinfo is not None else dt.astimezone()
 
-    date_patterns = [
-        r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
-        r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?\b',
-        r'\b\d{1,2}(?:st|nd|rd|th)?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\b',
-        r'\b\d{4}-\d{1,2}-\d{1,2}\b',
-        r'\b(?:May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?\b'
-    ]
+@lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _parse_datetime_cached(text, today):
+    return _parse_datetime(text, today)
+
+def resolve_datetime(text, cache=True):
+    """Parse a date/time string into an aware datetime, or None.
+
+    Whitespace is normalized before the LRU lookup so the same format from
+    the same sender is only tokenized by dateutil once per day.
+    """
+    text = " ".join(text.split())
+    if not text:
+        return None
+    if cache:
+        return _parse_datetime_cached(text, date.today())
+    return _parse_datetime(text, date.today())
+
+def to_epoch(dt):
+    """UTC epoch seconds for a datetime (naive values are local time), or None"""
+    return int(dt.timestamp()) if dt is not None else None
 
-    has_time_pattern = any(re.search(pattern, email_body, re.IGNORECASE) for pattern in time_patterns)
-    has_date_pattern = any(re.search(pattern, email_body, re.IGNORECASE) for pattern in date_patterns)
+# Cap on decoded bytes per body part; huge newsletters and attachments are cut here
+MAX_BODY_BYTES = 256 * 1024
+# Base64 characters decoded per step (multiple of 4, so every chunk decodes on its own)
+_B64_CHUNK = 64 * 1024
 
-    # Strong platform signals — time alone is enough with these
-    platform_words = [r'\bgmeet\b', r'\bgoogle meet\b', r'\bzoom\b', r'\bwebex\b',
-                      r'\bmicrosoft teams\b', r'\bmeet\.google\b', r'\bzoom\.us\b']
-    has_strong_platform = any(re.search(p, body_lower) for p in platform_words)
+# Elements whose content is never shown; found with one forward search each
+_HTML_DROP_OPEN_RE = re.compile(r'<(script|style|head)\b', re.IGNORECASE)
+_HTML_DROP_CLOSE_RE = {tag: re.compile(r'</%s\s*>' % tag, re.IGNORECASE) for tag in ('script', 'style', 'head')}
+_HTML_BREAK_RE = re.compile(r'<(?:br|/p|/div|/tr|/li|/h[1-6])\b[^>]*>', re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_BLANK_RUN_RE = re.compile(r'[ \t\r\f\v]+')
 
-    if has_strong_platform and has_time_pattern:
-        is_meeting = True
+def iter_parts(payload):
+    """Walk the MIME tree iteratively, yielding leaf parts in document order"""
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        children = part.get('parts')
+        if children:
+            stack.extend(reversed(children))
+        else:
+            yield part
+
+def decode_part(part, max_bytes=MAX_BODY_BYTES):
+    """Decode a part's base64url body incrementally, stopping after max_bytes"""
+    data = part.get('body', {}).get('data', '')
+    if not data:
+        return ""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    out = []
+    size = 0
+    for start in range(0, len(data), _B64_CHUNK):
+        chunk = data[start:start + _B64_CHUNK]
+        if len(chunk) % 4:
+            chunk += '=' * (-len(chunk) % 4)
+        raw = base64.urlsafe_b64decode(chunk)
+        if size + len(raw) >= max_bytes:
+            out.append(decoder.decode(raw[:max_bytes - size], final=True))
+            break
+        out.append(decoder.decode(raw))
+        size += len(raw)
+    else:
+        out.append(decoder.decode(b'', final=True))
+    return ''.join(out)
+
+def drop_hidden_html(html):
+    """Remove script/style/head elements in one pass; an unclosed one hides the rest"""
+    out = []
+    pos = 0
+    while True:
+        start = _HTML_DROP_OPEN_RE.search(html, pos)
+        if start is None:
+            out.append(html[pos:])
+            break
+        out.append(html[pos:start.start()])
+        end = _HTML_DROP_CLOSE_RE[start.group(1).lower()].search(html, start.end())
+        if end is None:
+            break
+        out.append(' ')
+        pos = end.end()
+    return ''.join(out)
+
+def html_to_text(html):
+    """Fast tag strip good enough for meeting detection, not a full HTML renderer"""
+    text = drop_hidden_html(html)
+    text = _HTML_BREAK_RE.sub('\n', text)
+    text = unescape(_HTML_TAG_RE.sub(' ', text))
+    lines = (_BLANK_RUN_RE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+def decode_message(payload, max_bytes=MAX_BODY_BYTES):
+    """Pick the useful bodies out of a Gmail payload in one walk of the MIME tree.
+
+    Returns {'calendar': ..., 'text': ...}: the first text/calendar part, and the
+    body text from the first text/plain part, falling back to stripped
+    text/html. Each part is decoded at most once and capped at max_bytes.
+    """
+    calendar = plain = html = None
+    for part in iter_parts(payload):
+        mime_type = (part.get('mimeType') or '').lower()
+        if mime_type == 'text/calendar':
+            if calendar is None:
+                calendar = decode_part(part, max_bytes)
+        elif part.get('filename'):
+            # Attached .txt/.html files are not the message body
+            continue
+        elif mime_type == 'text/plain':
+            if plain is None:
+                plain = decode_part(part, max_bytes)
+        elif mime_type == 'text/html':
+            if html is None and plain is None:
+                html = decode_part(part, max_bytes)
+        if calendar is not None and plain is not None:
+            break
+    if plain:
+        text = plain
+    elif html:
+        text = html_to_text(html)
     else:
+        text = calendar or ""
+    return {'calendar': calendar, 'text': text}
+
+def decode_body(payload, max_bytes=MAX_BODY_BYTES):
+    """Decode email body from base64"""
+    return decode_message(payload, max_bytes)['text']
+
+# Meeting vocabulary, matched as whole words against the lowercased body
+MEETING_WORDS = [
+    'meeting', 'call', 'appointment', 'conference', 'webinar',
+    'session', 'discussion', 'sync', 'catch up', 'standup',
+    'review', 'interview', 'zoom', 'teams', 'google meet',
+    'webex', 'schedule', 'invite', 'meet', 'masterclass',
+    'workshop', 'training', 'event', 'class', 'seminar'
+]
+
+# Strong platform signals — time alone is enough with these
+PLATFORM_WORDS = [r'gmeet', r'google meet', r'zoom', r'webex',
+                  r'microsoft teams', r'meet\.google', r'zoom\.us']
+
+TIME_PATTERNS = [
+    r'\b\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)\b',
+    r'\b\d{1,2}\s*(?:AM|PM|am|pm)\b',
+    r'\bat\s+\d{1,2}(?::\d{2})?\b',
+    r'\b(?:today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
+    r'\b\d{1,2}(?::\d{2})?\s*(?:IST|EST|PST|CST|UTC|GMT|EDT|PDT|CDT)\b'
+]
+
+DATE_PATTERNS = [
+    r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',
+    r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?\b',
+    r'\b\d{1,2}(?:st|nd|rd|th)?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\b',
+    r'\b\d{4}-\d{1,2}-\d{1,2}\b',
+    r'\b(?:May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?\b'
+]
+
+MeetingSignals = namedtuple('MeetingSignals', ['has_meeting_word', 'has_time', 'has_date', 'has_platform'])
+
+class MeetingClassifier:
+    """Rule-based meeting detector with each pattern family compiled into one alternation"""
+
+    def __init__(self, keywords=()):
+        words = [re.escape(w) for w in MEETING_WORDS] + [re.escape(kw.strip()) for kw in keywords]
+        self.meeting_re = re.compile(r'\b(?:' + '|'.join(words) + r')\b')
+        self.platform_re = re.compile(r'\b(?:' + '|'.join(PLATFORM_WORDS) + r')\b')
+        self.time_re = re.compile('|'.join(TIME_PATTERNS), re.IGNORECASE)
+        self.date_re = re.compile('|'.join(DATE_PATTERNS), re.IGNORECASE)
+
+    def signals(self, email_body):
+        body_lower = email_body.lower()
+        return MeetingSignals(
+            self.meeting_re.search(body_lower) is not None,
+            self.time_re.search(email_body) is not None,
+            self.date_re.search(email_body) is not None,
+            self.platform_re.search(body_lower) is not None,
+        )
+
+    @staticmethod
+    def decide(signals):
+        if signals.has_platform and signals.has_time:
+            return True
         # General case: need meeting word + time + date (all three to avoid newsletters)
-        is_meeting = has_meeting_word and has_time_pattern and has_date_pattern
+        return signals.has_meeting_word and signals.has_time and signals.has_date
+
+    def classify(self, email_body):
+        signals = self.signals(email_body)
+        return self.decide(signals), signals
+
+@lru_cache(maxsize=16)
+def get_classifier(keywords=()):
+    """Classifier for a keyword tuple, built once and reused until the keywords change"""
+    return MeetingClassifier(keywords)
 
-    print(f"[DEBUG] Meeting detection: has_meeting_word={has_meeting_word}, has_time={has_time_pattern}, has_date={has_date_pattern}, has_platform={has_strong_platform}, result={is_meeting}")
+def contains_meeting(email_body, keywords=None):
+    """Meeting detection with rule-based patterns"""
+    is_meeting, signals = get_classifier(tuple(keywords or ())).classify(email_body)
+    logger.debug("Meeting detection: %s result=%s", signals, is_meeting)
     return is_meeting
 
 def extract_meeting_link(email_body):
@@ -117,20 +292,147 @@ def extract_meeting_title(email_body):
 
     return "Scheduled Meeting"
 
-def extract_meeting_details(email_body):
-    """Extract meeting details using regex patterns with fuzzy fallback."""
-    print(f"[DEBUG] Extracting meeting details from: {email_body[:200]}...")
+# Outlook writes Windows zone names into TZID; map the common ones to IANA
+WINDOWS_TIMEZONES = {
+    'India Standard Time': 'Asia/Kolkata',
+    'Eastern Standard Time': 'America/New_York',
+    'Central Standard Time': 'America/Chicago',
+    'Mountain Standard Time': 'America/Denver',
+    'Pacific Standard Time': 'America/Los_Angeles',
+    'GMT Standard Time': 'Europe/London',
+    'W. Europe Standard Time': 'Europe/Berlin',
+    'Romance Standard Time': 'Europe/Paris',
+    'Singapore Standard Time': 'Asia/Singapore',
+    'Tokyo Standard Time': 'Asia/Tokyo',
+    'AUS Eastern Standard Time': 'Australia/Sydney',
+    'UTC': 'UTC',
+}
+
+_ICS_FOLD_RE = re.compile(r'\r?\n[ \t]')
+_ICS_ESCAPE_RE = re.compile(r'\\([\\;,nN])')
+# iTIP methods sent by an organiser (None: a plain .ics with no METHOD line)
+ICS_ORGANIZER_METHODS = (None, 'REQUEST', 'PUBLISH', 'CANCEL')
+
+def _ics_unescape(value):
+    return _ICS_ESCAPE_RE.sub(lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+def _ics_split(line):
+    """Split 'NAME;PARAM=a;PARAM="b:c":value' into (NAME, {PARAM: a}, value)"""
+    in_quotes = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ':' and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return None, {}, ''
+    name, *raw_params = head.split(';')
+    params = {}
+    for param in raw_params:
+        key, _, val = param.partition('=')
+        params[key.upper()] = val.strip('"')
+    return name.upper(), params, value
+
+def _ics_datetime(value, params):
+    """DTSTART/DTEND value to a datetime: aware for UTC or TZID, naive local otherwise"""
+    value = value.strip()
+    if params.get('VALUE') == 'DATE' or len(value) == 8:
+        return datetime.strptime(value[:8], '%Y%m%d')
+    dt = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    if value.endswith('Z'):
+        return dt.replace(tzinfo=timezone.utc)
+    tzid = params.get('TZID')
+    if tzid:
+        zone = get_zone(WINDOWS_TIMEZONES.get(tzid, tzid))
+        if zone is not None:
+            return dt.replace(tzinfo=zone)
+    return dt
+
+def parse_ics(calendar_text):
+    """Read the first VEVENT of a text/calendar part into meeting details.
+
+    Returns a dict with title, time/end (timezone-aware when the invite says
+    so), link, uid, sequence and cancelled, or None when there is no usable
+    event or the part is an attendee message (REPLY, COUNTER, REFRESH,
+    DECLINECOUNTER) rather than an invite.
+    """
+    if not calendar_text or 'BEGIN:VEVENT' not in calendar_text:
+        return None
+    method = None
+    event = None
+    nested = 0
+    for line in _ICS_FOLD_RE.sub('', calendar_text).splitlines():
+        name, params, value = _ics_split(line)
+        component = value.strip().upper()
+        if name == 'METHOD':
+            method = component
+        elif name == 'BEGIN':
+            if component == 'VEVENT':
+                event = {}
+            elif event is not None:
+                # VALARM and friends carry their own DESCRIPTION/TRIGGER lines
+                nested += 1
+        elif name == 'END' and event is not None:
+            if component == 'VEVENT':
+                break
+            nested -= 1
+        elif event is not None and not nested and name and name not in event:
+            event[name] = (params, value)
+    # Attendee replies and counter-proposals echo the invite's UID and SEQUENCE;
+    # only organiser messages may create, update or cancel a meeting
+    if method not in ICS_ORGANIZER_METHODS:
+        return None
+    if not event or 'DTSTART' not in event:
+        return None
+    try:
+        start = _ics_datetime(event['DTSTART'][1], event['DTSTART'][0])
+        end = _ics_datetime(event['DTEND'][1], event['DTEND'][0]) if 'DTEND' in event else None
+    except ValueError:
+        return None
+
+    def text(name):
+        return _ics_unescape(event[name][1]).strip() if name in event else None
+
+    link = text('URL') or text('X-GOOGLE-CONFERENCE')
+    if not link:
+        link = extract_meeting_link(f"{text('LOCATION') or ''}\n{text('DESCRIPTION') or ''}")
+    try:
+        sequence = int(text('SEQUENCE') or 0)
+    except ValueError:
+        sequence = 0
+    status = (text('STATUS') or '').upper()
+    return {
+        'title': text('SUMMARY') or "Scheduled Meeting",
+        'time': start,
+        'end': end,
+        'link': link,
+        'uid': text('UID'),
+        'sequence': sequence,
+        'cancelled': method == 'CANCEL' or status == 'CANCELLED',
+    }
+
+def extract_meeting_details(email_body, calendar=None):
+    """Extract meeting details, from the iCalendar part when there is one,
+    otherwise using regex patterns with fuzzy fallback."""
+    ics_details = parse_ics(calendar)
+    if ics_details:
+        logger.debug("iCalendar event: %s at %s", ics_details['title'], ics_details['time'])
+        return {**ics_details, 'method': 'ics'}
+
+    logger.debug("Extracting meeting details from: %.200s...", email_body)
 
     title = extract_meeting_title(email_body)
     link = extract_meeting_link(email_body)
 
-    # Time value: \d{1,2}(:\d{2})?\s*(AM|PM) — handles both "5pm" and "5:00pm"
-    TIME_RE = r'\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm)'
+    # Time value: \d{1,2}(:\d{2})?\s*(AM|PM) — handles both "5pm" and "5:00pm",
+    # plus a trailing zone abbreviation ("5pm IST") for resolve_datetime to apply
+    TIME_RE = r'\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm)' + TIMEZONE_SUFFIX_RE
     DATE_RE = r'(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{1,2}-\d{1,2}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?,?\s*(?:\d{4})?|\d{1,2}(?:st|nd|rd|th)?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*(?:\s+\d{4})?)'
 
     patterns_to_try = [
         # Pattern 0: "at 5pm 11-06-2025" or "5pm 11-06-2025"
-        (rf'(?:at\s+)?({TIME_RE})\s+({DATE_RE})', lambda g: f"{g[0]} {g[1]}"),
+        (rf'(?:at\s+)?({TIME_RE})\s+({DATE_RE}{TIMEZONE_SUFFIX_RE})', lambda g: f"{g[0]} {g[1]}"),
         # Pattern 1: "11-06-2025 at 5pm" or "11-06-2025 5pm"
         (rf'({DATE_RE})\s+(?:at\s+)?({TIME_RE})', lambda g: f"{g[0]} {g[1]}"),
         # Pattern 2: "Date: ... Time: ..." (multiline)
@@ -145,16 +447,13 @@ def extract_meeting_details(email_body):
     for i, (pattern, builder) in enumerate(patterns_to_try):
         match = re.search(pattern, email_body, re.IGNORECASE | re.DOTALL)
         if match:
-            try:
-                groups = match.groups()
-                datetime_str = builder(groups)
-                print(f"[DEBUG] Pattern {i+1} matched → '{datetime_str}'")
-                meeting_time = parse(datetime_str, fuzzy=True, dayfirst=True)
-                print(f"[DEBUG] Extracted time: {meeting_time}")
-                return {'title': title, 'time': meeting_time, 'link': link}
-            except Exception as e:
-                print(f"[DEBUG] Pattern {i+1} parse error: {e}")
+            datetime_str = builder(match.groups())
+            meeting_time = resolve_datetime(datetime_str)
+            if meeting_time is None:
+                logger.debug("Pattern %d parse error: '%s'", i + 1, datetime_str)
                 continue
+            logger.debug("Pattern %d matched '%s' -> %s", i + 1, datetime_str, meeting_time)
+            return {'title': title, 'time': meeting_time, 'link': link, 'method': f'pattern_{i + 1}'}
 
     # Fuzzy fallback: try parsing each line that contains both a time and a date hint
     for line in email_body.splitlines():
@@ -164,31 +463,26 @@ def extract_meeting_details(email_body):
         has_time = re.search(TIME_RE, line, re.IGNORECASE)
         has_date = re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', line, re.IGNORECASE)
         if has_time and has_date:
-            try:
-                meeting_time = parse(line, fuzzy=True, dayfirst=True)
-                print(f"[DEBUG] Fuzzy line parse: '{line}' → {meeting_time}")
-                return {'title': title, 'time': meeting_time, 'link': link}
-            except Exception:
-                continue
+            meeting_time = resolve_datetime(line)
+            if meeting_time is not None:
+                logger.debug("Fuzzy line parse: '%s' -> %s", line, meeting_time)
+                return {'title': title, 'time': meeting_time, 'link': link, 'method': 'fuzzy_line'}
 
     # Last resort: try fuzzy parsing the whole text
-    try:
-        meeting_time = parse(email_body[:500], fuzzy=True, dayfirst=True)
-        print(f"[DEBUG] Fuzzy full-text parse → {meeting_time}")
-        return {'title': title, 'time': meeting_time, 'link': link}
-    except Exception:
-        pass
+    # Whole bodies rarely repeat, so keep them out of the cache
+    meeting_time = resolve_datetime(email_body[:500], cache=False)
+    if meeting_time is not None:
+        logger.debug("Fuzzy full-text parse -> %s", meeting_time)
+        return {'title': title, 'time': meeting_time, 'link': link, 'method': 'fuzzy_text'}
 
-    print(f"[DEBUG] No time extracted")
-    return {'title': title, 'time': None, 'link': link}
+    logger.debug("No time extracted")
+    return {'title': title, 'time': None, 'link': link, 'method': 'none'}
 
 def send_notification(sender, meeting_title, start_time, meeting_link=None):
     """Log notification (desktop notifications not available in web environment)"""
+    if start_time and start_time.tzinfo is not None:
+        start_time = start_time.astimezone()
     time_str = start_time.strftime("%I:%M %p") if start_time else "Time not specified"
     date_str = start_time.strftime("%A, %d %B %Y") if start_time else "Date not specified"
-    print(f"[NOTIFICATION] Meeting Alert!")
-    print(f"  Title: {meeting_title}")
-    print(f"  From: {sender}")
-    print(f"  Time: {time_str} on {date_str}")
-    if meeting_link:
-        print(f"  Link: {meeting_link}")
+    logger.info("Meeting alert: %s | from %s | %s on %s%s", meeting_title, sender, time_str, date_str,
+                f" | {meeting_link}" if meeting_link else "")
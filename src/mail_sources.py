@@ -0,0 +1,271 @@
+"""Mailboxes the monitor can scan.
+
+scan_account() only talks to a MailSource, so the same detection pipeline
+runs against the Gmail API in production and against local archives (mbox,
+Maildir or Gmail-API-shaped JSON) for offline replay and load tests.
+"""
+import base64
+import email
+import json
+import mmap
+import os
+import re
+from email import policy
+
+from src.gmail_sync import sync_messages, batch_get, watch
+
+# Messages handed out per sync() call by local sources, like one page of history
+PAGE_SIZE = 500
+
+_MBOX_FROM_RE = re.compile(rb'^From ', re.MULTILINE)
+
+
+class MailSource:
+    """Interface for a mailbox. Messages are Gmail-API-shaped dicts whatever the backend."""
+
+    def email_address(self):
+        raise NotImplementedError
+
+    def sync(self, queries, history_id=None):
+        """Return (message_ids, history_id, searched) for mail newer than history_id.
+
+        `queries` are Gmail search strings whose matches are merged; `searched`
+        tells the caller whether they were already applied.
+        """
+        raise NotImplementedError
+
+    def get_many(self, message_ids, format='full', metadata_headers=None):
+        """Fetch messages as {id: message}; ids that no longer exist are left out."""
+        raise NotImplementedError
+
+    def watch(self, topic_name):
+        """Subscribe to push notifications; returns {historyId, expiration (epoch ms)}.
+
+        Sources that can't push raise NotImplementedError and are simply polled.
+        """
+        raise NotImplementedError
+
+
+class GmailSource(MailSource):
+    def __init__(self, service):
+        self.service = service
+
+    def email_address(self):
+        return self.service.users().getProfile(userId='me').execute().get('emailAddress')
+
+    def sync(self, queries, history_id=None):
+        return sync_messages(self.service, queries, history_id)
+
+    def get_many(self, message_ids, format='full', metadata_headers=None):
+        return batch_get(self.service, message_ids, format=format, metadata_headers=metadata_headers)
+
+    def watch(self, topic_name):
+        return watch(self.service, topic_name)
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def _to_payload(part):
+    """Convert an email.message part (recursively) into a Gmail API payload dict."""
+    payload = {
+        'mimeType': part.get_content_type(),
+        'headers': [{'name': name, 'value': str(value)} for name, value in part.items()],
+        'body': {'size': 0},
+    }
+    if part.is_multipart():
+        payload['parts'] = [_to_payload(sub) for sub in part.get_payload()]
+        return payload
+    data = part.get_payload(decode=True) or b''
+    charset = part.get_content_charset()
+    # Gmail hands back the transfer-decoded bytes; the decoders expect UTF-8 text
+    if payload['mimeType'].startswith('text/') and charset and charset.lower() not in ('utf-8', 'us-ascii'):
+        try:
+            data = data.decode(charset, errors='replace').encode('utf-8')
+        except LookupError:
+            pass
+    payload['body'] = {'size': len(data), 'data': _b64(data)}
+    return payload
+
+
+def to_gmail_message(msg_id, payload, snippet=''):
+    """Wrap a payload the way messages.get(format='full') returns it.
+
+    Nothing reads the snippet, so it is not built from the body; JSON entries
+    that carry one keep it.
+    """
+    return {'id': msg_id, 'threadId': msg_id, 'labelIds': ['INBOX'], 'snippet': snippet, 'payload': payload}
+
+
+def metadata_view(message, metadata_headers=None):
+    """What messages.get(format='metadata') would return for a full message."""
+    wanted = {h.lower() for h in (metadata_headers or [])}
+    headers = [h for h in message['payload'].get('headers', []) if not wanted or h['name'].lower() in wanted]
+    view = {k: v for k, v in message.items() if k != 'payload'}
+    view['payload'] = {'mimeType': message['payload'].get('mimeType'), 'headers': headers}
+    return view
+
+
+class LocalSource(MailSource):
+    """Base for archives on disk.
+
+    Every message is new exactly once: sync() hands out page_size ids at a
+    time and history_id is the offset of the next unread one, so repeated
+    scans walk the archive the way history.list walks new mail. The queries
+    are not applied (searched=False), so as with history results only the
+    sender allow-list filters messages before the classifier reads each full
+    body. Subclasses provide keys() and load(msg_id).
+    """
+
+    def __init__(self, path, email_address=None, page_size=PAGE_SIZE):
+        self.path = path
+        self._email = email_address
+        self.page_size = page_size
+        self._ids = None
+        # Messages converted for the metadata pass, reused by the full fetch that follows
+        self._recent = {}
+
+    def keys(self):
+        raise NotImplementedError
+
+    def load(self, msg_id):
+        """The message as a Gmail API dict, or None if it can't be read."""
+        raise NotImplementedError
+
+    def email_address(self):
+        return self._email or f"replay:{os.path.basename(os.path.normpath(self.path))}"
+
+    def __len__(self):
+        if self._ids is None:
+            self._ids = self.keys()
+        return len(self._ids)
+
+    def sync(self, queries, history_id=None):
+        if self._ids is None:
+            self._ids = self.keys()
+        start = int(history_id or 0)
+        ids = self._ids[start:start + self.page_size]
+        self._recent = {}
+        return ids, str(start + len(ids)), False
+
+    def get_many(self, message_ids, format='full', metadata_headers=None):
+        results = {}
+        for msg_id in message_ids:
+            message = self._recent.get(msg_id)
+            if message is None:
+                message = self.load(msg_id)
+                if message is None:
+                    continue
+                self._recent[msg_id] = message
+            results[msg_id] = metadata_view(message, metadata_headers) if format == 'metadata' else message
+        return results
+
+    def close(self):
+        pass
+
+
+class MboxSource(LocalSource):
+    """mbox file, memory-mapped: only the offsets of each message are indexed up front."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file: nothing to map
+            self._map = b''
+        self._spans = {}
+
+    def keys(self):
+        starts = [m.start() for m in _MBOX_FROM_RE.finditer(self._map)]
+        ids = []
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(self._map)
+            msg_id = f"mbox{i + 1:06d}"
+            self._spans[msg_id] = (start, end)
+            ids.append(msg_id)
+        return ids
+
+    def load(self, msg_id):
+        span = self._spans.get(msg_id)
+        if span is None:
+            return None
+        message = email.message_from_bytes(self._map[span[0]:span[1]], policy=policy.compat32)
+        return to_gmail_message(msg_id, _to_payload(message))
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+
+class MaildirSource(LocalSource):
+    """Maildir directory: messages in new/ and cur/, in filename (delivery) order."""
+
+    def keys(self):
+        ids = []
+        for sub in ('new', 'cur'):
+            folder = os.path.join(self.path, sub)
+            if os.path.isdir(folder):
+                ids.extend(os.path.join(sub, name) for name in sorted(os.listdir(folder)) if not name.startswith('.'))
+        return ids
+
+    def load(self, msg_id):
+        try:
+            with open(os.path.join(self.path, msg_id), 'rb') as f:
+                message = email.message_from_binary_file(f, policy=policy.compat32)
+        except OSError:
+            return None
+        return to_gmail_message(msg_id, _to_payload(message))
+
+
+class JsonSource(LocalSource):
+    """Gmail-API-shaped JSON: a directory with one message per file, or one file
+    holding a list of messages (such as `python -m benchmarks.corpus` output).
+    Entries may be full messages or bare payloads."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self._bundle = None
+
+    def keys(self):
+        if os.path.isdir(self.path):
+            return sorted(name[:-5] for name in os.listdir(self.path) if name.endswith('.json'))
+        with open(self.path) as f:
+            entries = json.load(f)
+        self._bundle = {}
+        for i, entry in enumerate(entries):
+            msg_id = entry.get('id') or f"json{i + 1:06d}"
+            self._bundle[msg_id] = entry
+        return list(self._bundle)
+
+    def load(self, msg_id):
+        if self._bundle is not None:
+            entry = self._bundle.get(msg_id)
+        else:
+            try:
+                with open(os.path.join(self.path, msg_id + '.json')) as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+        if entry is None:
+            return None
+        if 'payload' not in entry:
+            entry = {'payload': entry}
+        return to_gmail_message(msg_id, entry['payload'], entry.get('snippet', ''))
+
+
+def open_source(path, format=None, **kwargs):
+    """Open a local archive, guessing mbox/maildir/json from the path when format is None."""
+    if format is None:
+        if os.path.isdir(path):
+            is_maildir = os.path.isdir(os.path.join(path, 'cur')) or os.path.isdir(os.path.join(path, 'new'))
+            format = 'maildir' if is_maildir else 'json'
+        else:
+            format = 'json' if path.endswith('.json') else 'mbox'
+    sources = {'mbox': MboxSource, 'maildir': MaildirSource, 'json': JsonSource}
+    if format not in sources:
+        raise ValueError(f"Unknown mail source format: {format}")
+    return sources[format](path, **kwargs)
@@ -1,16 +1,70 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, RedirectResponse
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import JSONResponse, FileResponse, HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
 from typing import Optional
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+import logging
 import threading
 import time
 import os
-from src.auth import authenticate, get_token_files, get_authorization_url, exchange_code
+from src.auth import authenticate, credentials, get_token_files, get_authorization_url, exchange_code
 import urllib.parse
-from src.mail_processor import decode_body, contains_meeting, extract_meeting_details
+from src.gmail_sync import build_service, is_rate_limited, warm_up, QUOTA_UNITS, LIST_PAGE_SIZE
+from src.mail_sources import GmailSource
+from src.pipeline import ParsePipeline
+from src.query_planner import QueryPlan
+from src.scheduler import MonitorScheduler, ScanResult
+from src.store import MeetingStore
+from src.meeting_index import MeetingIndex, NO_TIME, meeting_timestamp
+from src.events import EventBus, parse_last_event_id
+from src.alarms import AlarmScheduler, log_hook, webhook_hook
+from src.state import SettingsStore, Counters, AccountRegistry, ValidationError
+from src import metrics
 
-app = FastAPI()
+# LOG_LEVEL=DEBUG turns on per-message tracing; debug calls cost nothing when it is off
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+                    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+def scan_interval():
+    return settings.current.checkInterval * 60
+
+def push_interval():
+    """Safety-net polling interval for accounts that get push notifications."""
+    return settings.current.pushSafetyNetMinutes * 60
+
+@asynccontextmanager
+async def lifespan(app):
+    global scheduler, store, meeting_index, alarms
+    store = MeetingStore()
+    meeting_index = MeetingIndex()
+    for meeting in store.meetings():
+        meeting_index.add(meeting)
+    alarms = AlarmScheduler(settings.current.alertTime * 60, hooks=[
+        log_hook,
+        webhook_hook(lambda: settings.get("alarmWebhook")),
+        publish_alarm,
+    ])
+    upcoming, _ = meeting_index.query(since=time.time())
+    for meeting in upcoming:
+        alarms.schedule(meeting, meeting_timestamp(meeting))
+    alarms.start()
+    # Load the Google client stack in the background: the server answers
+    # requests right away and the first scan or OAuth flow starts warm
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    scheduler = MonitorScheduler(monitor_emails_for_token, scan_interval,
+                                 max_concurrency=settings.current.maxConcurrentScans,
+                                 quota_per_minute=settings.current.quotaUnitsPerMinute,
+                                 is_rate_limited=is_rate_limited, push_interval=push_interval)
+    yield
+    await scheduler.stop()
+    alarms.stop()
+    if pipeline is not None:
+        pipeline.stop()
+    store.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,12 +72,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 def _get_redirect_uri():
-    """Read the registered redirect URI from credentials.json."""
-    import json
+    """The registered redirect URI from credentials.json, re-read only when the file changes."""
     creds_path = os.path.join(os.path.dirname(__file__), "../credentials.json")
+    return _read_redirect_uri(creds_path, os.stat(creds_path).st_mtime_ns)
+
+@lru_cache(maxsize=1)
+def _read_redirect_uri(creds_path, mtime_ns):
+    import json
     with open(creds_path) as f:
         data = json.load(f)
     # Supports both 'web' and 'installed' credential types
@@ -33,67 +92,232 @@ def _get_redirect_uri():
         return uris[0]
     raise ValueError("No redirect_uris found in credentials.json")
 
-meetings = []
-settings = {
-    "checkInterval": 5,
-    "alertTime": 10,
-    "emailKeywords": "meeting, zoom, conference, appointment, masterclass, workshop, meet, gmeet, google meet",
-    "allowedMailIds": ""
-}
-stats = {
-    "totalMeetings": 0,
-    "upcomingMeetings": 0,
-    "emailsScanned": 0,
-    "successRate": 0
-}
+# Read by scan threads and handlers alike: see src/state.py
+settings = SettingsStore()
+counters = Counters("emailsScanned")
+# Messages the classifier judged to be meetings, per account: the scan pacing signal
+meeting_counts = Counters()
 is_running = False
+pipeline = None
+scheduler = None
+store = None
+meeting_index = MeetingIndex()
+events = EventBus()
+alarms = None
 
-class Settings(BaseModel):
-    checkInterval: int
-    alertTime: int
-    emailKeywords: str
-    isSystemRunning: Optional[bool] = False
+def publish_alarm(meeting, start_ts):
+    events.publish("alarm", {**meeting, "startsAt": start_ts})
 
-class AccountRequest(BaseModel):
-    email: str
+def query_meetings(response, since, until, account, limit, cursor):
+    """Page through meetings by time; the next page's cursor goes in X-Next-Cursor."""
+    bounds = {}
+    for name, value in (("since", since), ("until", until)):
+        try:
+            bounds[name] = parse_time(value).timestamp() if value else None
+        except ValueError:
+            return JSONResponse({"error": f"invalid {name}: expected an ISO 8601 time"}, status_code=400)
+    try:
+        items, next_cursor = meeting_index.query(
+            **bounds,
+            account=account,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        # Only a cursor that did not come from X-Next-Cursor gets here
+        return JSONResponse({"error": "invalid cursor"}, status_code=400)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 @app.get("/api/meetings")
-def get_meetings():
-    return meetings
+def get_meetings(response: Response, since: Optional[str] = None, until: Optional[str] = None,
+                 account: Optional[str] = None, limit: Optional[int] = Query(None, ge=1),
+                 cursor: Optional[str] = None):
+    return query_meetings(response, since, until, account, limit, cursor)
 
 @app.post("/api/settings")
 async def save_settings(req: Request):
-    global settings
+    """Validate and apply a partial settings update; invalid input changes nothing."""
     data = await req.json()
-    settings.update(data)
-    return {"status": "ok", "settings": settings}
+    if not isinstance(data, dict):
+        return JSONResponse({"status": "error", "errors": ["expected a JSON object"]}, status_code=422)
+    try:
+        settings.update(data)
+    except ValidationError as e:
+        return JSONResponse({"status": "error", "errors": e.errors(include_url=False, include_context=False)},
+                            status_code=422)
+    return {"status": "ok", "settings": settings.as_dict(), "version": settings.version}
+
+@settings.subscribe
+def apply_settings(current, changed):
+    """Push settings changes into the running components that cache them."""
+    if "alertTime" in changed and alarms is not None:
+        alarms.set_lead(current.alertTime * 60)
+    if "quotaUnitsPerMinute" in changed and scheduler is not None:
+        scheduler.budget.set_rate(current.quotaUnitsPerMinute)
+    if "maxConcurrentScans" in changed and scheduler is not None:
+        scheduler.set_max_concurrency(current.maxConcurrentScans)
+
+def current_stats():
+    total = meeting_index.total
+    scanned = counters.get("emailsScanned")
+    return {
+        "totalMeetings": total,
+        "upcomingMeetings": meeting_index.count_upcoming(time.time()),
+        "emailsScanned": scanned,
+        "successRate": scanned and int((total / scanned) * 100) or 0,
+    }
+
+@app.get("/api/health")
+def health():
+    """Readiness probe for the UI: answers as soon as the server is up."""
+    return {"status": "ok", "running": is_running}
 
 @app.get("/api/stats")
 def get_stats():
-    stats["upcomingMeetings"] = len([m for m in meetings if m.get("time") and parse_time(m["time"]) > time_now()])
-    stats["successRate"] = stats["emailsScanned"] and int((stats["totalMeetings"] / stats["emailsScanned"]) * 100) or 0
-    return stats
+    return current_stats()
+
+@app.get("/api/events")
+async def stream_events(request: Request):
+    """Server-Sent Events: meeting, stats, account and resync events."""
+    last_event_id = parse_last_event_id(
+        request.headers.get("last-event-id") or request.query_params.get("lastEventId"))
+    return StreamingResponse(
+        events.stream(last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/alarms")
+def get_alarm_stats():
+    return {"pending": alarms.pending(), "fired": alarms.fired, "leadSeconds": alarms.lead_seconds}
+
+@app.post("/api/gmail/push")
+async def gmail_push(req: Request, token: Optional[str] = None):
+    """Pub/Sub push delivery for a watched mailbox: scan that account now.
+
+    Anything that isn't a usable notification is still acknowledged (204) so
+    Pub/Sub doesn't keep redelivering it; only a wrong token is refused.
+    """
+    import base64, binascii, json
+    expected = settings.current.pushToken
+    if expected and token != expected:
+        metrics.PUSH_NOTIFICATIONS.inc(result="forbidden")
+        return JSONResponse({"error": "invalid token"}, status_code=403)
+    try:
+        envelope = await req.json()
+        notification = json.loads(base64.b64decode(envelope["message"]["data"]))
+        email = notification["emailAddress"].lower()
+        history_id = int(notification["historyId"])
+    except (ValueError, KeyError, TypeError, AttributeError, binascii.Error):
+        metrics.PUSH_NOTIFICATIONS.inc(result="invalid")
+        return Response(status_code=204)
+    token_path = account_states.find(email)
+    if not is_running or not settings.current.pushTopic or token_path is None:
+        result = "ignored"
+    elif int(account_states[token_path]["history_id"] or 0) >= history_id:
+        # Pub/Sub delivers at least once, and a scan may already have picked this change up
+        result = "stale"
+    else:
+        result = "scanned" if scheduler.trigger(token_path) else "ignored"
+    logger.debug("Push notification for %s at history %s: %s", email, history_id, result)
+    metrics.PUSH_NOTIFICATIONS.inc(result=result)
+    return Response(status_code=204)
+
+@app.get("/api/metrics")
+def get_metrics():
+    """Prometheus text-format metrics for scans, Gmail calls and the parse pipeline."""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
+metrics.gauge("meeting_monitor_pipeline_queue_depth", "Parse jobs waiting for a worker",
+              fn=lambda: pipeline.stats()["queueDepth"] if pipeline else 0)
+metrics.gauge("meeting_monitor_pipeline_in_flight", "Parse jobs running or awaiting their callback",
+              fn=lambda: pipeline.stats()["inFlight"] if pipeline else 0)
+metrics.gauge("meeting_monitor_meetings", "Meetings currently indexed", fn=lambda: meeting_index.total)
+metrics.gauge("meeting_monitor_alarms_pending", "Reminders waiting to fire",
+              fn=lambda: alarms.pending() if alarms else 0)
+metrics.gauge("meeting_monitor_event_clients", "Connected Server-Sent Events clients", fn=lambda: events.client_count())
+
+@app.get("/api/pipeline")
+def get_pipeline_stats():
+    return pipeline.stats() if pipeline else {"workers": 0, "queueDepth": 0, "inFlight": 0}
+
+# Guards replacing the pipeline and counts the scans still submitting to each one
+_pipeline_lock = threading.Lock()
+_pipeline_leases = {}
+
+def _replace_pipeline():
+    """With _pipeline_lock held: start a pipeline matching parseWorkers if needed.
+
+    Returns the pipeline it replaced when nothing is submitting to it any
+    more, for the caller to stop outside the lock.
+    """
+    global pipeline
+    workers = settings.current.parseWorkers
+    if pipeline is not None and pipeline.workers == workers:
+        return None
+    old, pipeline = pipeline, ParsePipeline(workers=workers).start()
+    return old if old is not None and not _pipeline_leases.get(old) else None
+
+def get_pipeline():
+    """Return the parse pipeline, replacing it if the worker count setting changed.
+
+    A replaced pipeline is stopped, which drains its queue, once no scan is
+    still submitting to it (see pipeline_lease()).
+    """
+    with _pipeline_lock:
+        retired = _replace_pipeline()
+        current = pipeline
+    if retired is not None:
+        retired.stop()
+    return current
+
+@contextmanager
+def pipeline_lease():
+    """The current pipeline, kept running until the caller is done submitting to it."""
+    with _pipeline_lock:
+        retired = _replace_pipeline()
+        current = pipeline
+        _pipeline_leases[current] = _pipeline_leases.get(current, 0) + 1
+    if retired is not None:
+        retired.stop()
+    try:
+        yield current
+    finally:
+        with _pipeline_lock:
+            _pipeline_leases[current] -= 1
+            retire = not _pipeline_leases[current] and current is not pipeline
+            if not _pipeline_leases[current]:
+                del _pipeline_leases[current]
+        if retire:
+            current.stop()
+
+@app.get("/api/monitor")
+def get_monitor_status():
+    return scheduler.status()
 
 @app.post("/api/start")
-def start_monitoring():
+async def start_monitoring():
     global is_running
     if not is_running:
         is_running = True
-        token_files = get_token_files()
-        for token_path in token_files:
-            t = threading.Thread(target=monitor_emails_for_token, args=(token_path,), daemon=True)
-            t.start()
+        get_pipeline()
+        scheduler.start(get_token_files())
     return {"status": "started"}
 
 @app.post("/api/stop")
-def stop_monitoring():
+async def stop_monitoring():
     global is_running
     is_running = False
+    await scheduler.stop()
     return {"status": "stopped"}
 
 @app.get("/api/check-emails")
-def api_check_emails():
-    return meetings
+def api_check_emails(response: Response, since: Optional[str] = None, until: Optional[str] = None,
+                     account: Optional[str] = None, limit: Optional[int] = Query(None, ge=1),
+                     cursor: Optional[str] = None):
+    return query_meetings(response, since, until, account, limit, cursor)
 
 @app.get("/api/accounts")
 def get_accounts():
@@ -151,9 +375,10 @@ async def oauth_callback(request: Request):
 
     try:
         creds = exchange_code(code, redirect_uri, state, token_path)
-        # Start monitoring thread for this account
-        t = threading.Thread(target=monitor_emails_for_token, args=(token_path,), daemon=True)
-        t.start()
+        # Start monitoring this account; re-authenticating an existing one is a no-op
+        if is_running:
+            account_states.pop(token_path, None)
+            scheduler.add(token_path)
         return HTMLResponse(f"""
         <html><body style="font-family:sans-serif;padding:40px;text-align:center;background:#f0fdf4">
         <h2>✅ Account connected!</h2>
@@ -167,7 +392,7 @@ async def oauth_callback(request: Request):
         </script>
         </body></html>""")
     except Exception as e:
-        print(f"[ERROR] OAuth callback failed: {e}")
+        logger.error("OAuth callback failed: %s", e)
         return HTMLResponse(f"""
         <html><body style="font-family:sans-serif;padding:40px;text-align:center;background:#fef2f2">
         <h2>❌ Authentication error</h2><p>{str(e)}</p>
@@ -183,37 +408,134 @@ async def remove_account(req: Request):
     try:
         if os.path.exists(token_path):
             os.remove(token_path)
+        credentials.forget(token_path)
+        account_states.pop(token_path, None)
         return {"success": True}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 def parse_time(dt_str):
-    from dateutil.parser import parse
-    from datetime import datetime
-    try:
-        dt = parse(dt_str)
-        if dt.tzinfo is not None:
-            dt = dt.astimezone().replace(tzinfo=None)
-        return dt
-    except Exception:
-        return time_now()
-
-def time_now():
+    """Aware datetime for an ISO 8601 API time parameter (naive means local); raises ValueError."""
     from datetime import datetime
-    return datetime.now()
+    dt = datetime.fromisoformat(dt_str)
+    return dt if dt.tzinfo is not None else dt.astimezone()
 
-def monitor_emails_for_token(token_path):
-    creds = authenticate(token_path)
-    if not creds:
-        print(f"[ERROR] Could not authenticate with token: {token_path}")
+def time_fields(details):
+    """ISO start/end plus the UTC epoch start used for sorting and alarms."""
+    from src.mail_processor import to_epoch
+    return {
+        "time": details['time'].isoformat() if details['time'] else None,
+        "startTs": to_epoch(details['time']),
+        "end": details['end'].isoformat() if details.get('end') else None,
+    }
+
+def replace_meeting(old, new):
+    """Swap a meeting in the index and alarm schedule after an invite update or cancel."""
+    meeting_index.remove(old)
+    old_ts = meeting_timestamp(old)
+    if old_ts != NO_TIME:
+        alarms.cancel(old, old_ts)
+    if new is not None:
+        meeting_index.add(new)
+        new_ts = meeting_timestamp(new)
+        if new_ts != NO_TIME:
+            alarms.schedule(new, new_ts)
+
+def merge_duplicate(dedup_key, account):
+    """Add another receiving account to a stored meeting; returns True if it was new."""
+    merged = store.merge_account(dedup_key, account)
+    if merged is None:
+        return False
+    meeting_index.remove(merged)
+    meeting_index.add(merged)
+    events.publish("meeting-updated", merged)
+    return True
+
+def apply_calendar_change(job, details):
+    """Handle an iCalendar invite whose UID we already know, or a cancellation.
+
+    Returns True when the message was consumed here.
+    """
+    uid = details.get('uid')
+    if not uid:
+        return False
+    existing, sequence = store.find_by_uid(uid)
+    if details.get('cancelled'):
+        if existing:
+            store.delete_by_uid(uid)
+            replace_meeting(existing, None)
+            events.publish("meeting-cancelled", existing)
+            events.publish("stats", current_stats())
+            logger.info("Meeting cancelled: %s (%s)", existing['title'], uid)
+        return True
+    if existing is None:
+        return False
+    # Older SEQUENCE numbers are stale copies of an invite that was since updated
+    if details.get('sequence', 0) >= sequence:
+        fields = {"title": details['title'], **time_fields(details), "link": details['link']}
+        store.update_by_uid(uid, fields, details.get('sequence', 0))
+        # Another account's copy of the invite: list it on the same meeting
+        updated = store.merge_account(f"uid:{uid}", job["account"]) or {**existing, **fields}
+        replace_meeting(existing, updated)
+        events.publish("meeting-updated", updated)
+    else:
+        merge_duplicate(f"uid:{uid}", job["account"])
+    return True
+
+def handle_parsed_message(job, details):
+    """Pipeline callback: record a detected meeting, in the order messages were queued."""
+    store.mark_processed(job["account"], [job["id"]])
+    if details is None:
+        return
+    meeting_counts.add(job["account"])
+    if apply_calendar_change(job, details):
+        return
+    meeting_obj = {
+        "id": job["id"],
+        "title": details['title'],
+        **time_fields(details),
+        "sender": job["sender"],
+        "platform": "Unknown",
+        "link": details['link'],
+        "account": job["account"],
+        "accounts": [job["account"]],
+        "uid": details.get('uid'),
+    }
+    # An iCalendar UID identifies the event across accounts and resends; otherwise
+    # identical content at the same resolved time does (the same blast sent to
+    # several accounts), while a recurring reminder with the same text
+    # ("standup tomorrow at 10am") resolves to a new start each day
+    if details.get('uid'):
+        dedup_key = f"uid:{details['uid']}"
+    else:
+        dedup_key = f"content:{job['content_key']}:{meeting_obj['startTs']}"
+    if not store.add_meeting(meeting_obj, dedup_key, details.get('sequence', 0)):
+        if not merge_duplicate(dedup_key, job["account"]):
+            logger.debug("Skipping duplicate meeting %s (%s)", job['id'], dedup_key)
         return
-    from googleapiclient.discovery import build
-    service = build('gmail', 'v1', credentials=creds)
-    profile = service.users().getProfile(userId='me').execute()
-    account_email = profile.get('emailAddress')
-    print(f"[DEBUG] Monitoring for account: {account_email}")
-    processed_ids = set()
-    allowed_mail_ids = [s.strip().lower() for s in settings.get("allowedMailIds", "").split(",") if s.strip()]
+    metrics.MEETINGS.inc(account=job["account"])
+    meeting_index.add(meeting_obj)
+    start_ts = meeting_timestamp(meeting_obj)
+    if start_ts != NO_TIME:
+        alarms.schedule(meeting_obj, start_ts)
+    events.publish("meeting", meeting_obj)
+    events.publish("stats", current_stats())
+    from src.mail_processor import send_notification
+    send_notification(job["sender"], details['title'], details['time'], details['link'])
+
+# Per-account scan state, keyed by token path and reused across scheduled scans
+account_states = AccountRegistry()
+# Renew Gmail watches this long before they expire
+WATCH_RENEW_MARGIN = 24 * 3600
+
+def init_account(token_path, creds):
+    """Build the state an authenticated account's scans share."""
+    return account_state(GmailSource(build_service(creds)), creds)
+
+def compile_scan_config(current):
+    """Keywords, sender allow-list and Gmail query plan for one settings version."""
+    meeting_keywords = [kw.strip().lower() for kw in current.emailKeywords.split(",") if kw.strip()]
+    allowed_mail_ids = [s.strip().lower() for s in current.allowedMailIds.split(",") if s.strip()]
     if not allowed_mail_ids:
         import json
         config_path = os.path.join(os.path.dirname(__file__), "config.json")
@@ -221,60 +543,175 @@ def monitor_emails_for_token(token_path):
             with open(config_path) as f:
                 config = json.load(f)
                 allowed_mail_ids = [s.strip().lower() for s in config.get("allowed_senders", [])]
-    while is_running:
-        try:
-            # Read settings fresh on every scan so UI changes take effect
-            check_interval = int(settings.get("checkInterval", 5)) * 60
-            meeting_keywords = [kw.strip().lower() for kw in settings.get(
-                "emailKeywords",
-                "meeting, zoom, conference, appointment, masterclass, workshop, meet, gmeet, google meet"
-            ).split(",") if kw.strip()]
-
-            # Search subject OR body for any keyword (full-text, no subject: prefix)
-            keyword_query = " OR ".join([f'"{kw}"' for kw in meeting_keywords[:12]])
-            sender_filter = " OR ".join([f'from:{s}' for s in allowed_mail_ids]) if allowed_mail_ids else None
-            if sender_filter:
-                gmail_query = f'({sender_filter}) ({keyword_query}) newer_than:30d'
+    plan = QueryPlan(meeting_keywords, allowed_mail_ids)
+    logger.debug("Gmail queries: %s", plan.base_queries)
+    return {"keywords": meeting_keywords, "allowed_mail_ids": allowed_mail_ids, "plan": plan}
+
+# Recompiled only when the settings version changes, not on every scan
+scan_config = settings.derived(compile_scan_config)
+
+def account_state(source, creds=None):
+    """Scan state for one MailSource (a Gmail account, or a local archive when replaying)."""
+    account_email = source.email_address()
+    logger.info("Monitoring for account: %s", account_email)
+    return {
+        "source": source,
+        "credentials": creds,
+        "email": account_email,
+        "processed_ids": set(),
+        # Resume from the last persisted history ID so a restart doesn't re-list 30 days
+        "history_id": store.get_history_id(account_email),
+        # When history has expired, the resync only searches back to the last completed scan
+        "synced_at": store.get_synced_at(account_email),
+        # meeting_counts at the last scan; the difference is the activity reported to the pacer
+        "meetings_seen": meeting_counts.get(account_email),
+        "lock": threading.Lock(),
+    }
+
+def monitor_emails_for_token(token_path):
+    """Run one scan of a token's inbox; returns False if the account can't be monitored."""
+    # Cached per token file; refreshes ahead of expiry so the scan starts on a live token
+    creds = authenticate(token_path)
+    if not creds:
+        logger.error("Could not authenticate with token: %s", token_path)
+        account_states.pop(token_path, None)
+        events.publish("account", {"account": os.path.basename(token_path), "status": "unauthenticated"})
+        return False
+    state = account_states.get(token_path)
+    if state is None or state["credentials"] is not creds:
+        state = init_account(token_path, creds)
+        account_states[token_path] = state
+    # A scan left running by a quick stop/start must not overlap a new one
+    if not state["lock"].acquire(blocking=False):
+        return True
+    events.publish("account", {"account": state["email"], "status": "scanning"})
+    try:
+        watch_cost = ensure_watch(token_path, state)
+        with metrics.SCAN_SECONDS.time(account=state["email"]):
+            result = scan_account(state)
+        result = result._replace(cost=result.cost + watch_cost)
+    except Exception as e:
+        metrics.SCAN_ERRORS.inc(account=state["email"])
+        events.publish("account", {"account": state["email"], "status": "error", "error": str(e)})
+        raise
+    finally:
+        state["lock"].release()
+    events.publish("account", {"account": state["email"], "status": "idle", "lastScan": time.time()})
+    events.publish("stats", current_stats())
+    return result
+
+def ensure_watch(token_path, state):
+    """Keep the account's Gmail watch current while push mode is on; returns the quota used.
+
+    Watches lapse after at most 7 days, so they are renewed a day early. An
+    account whose watch can't be set up (no Pub/Sub permission, a local
+    source) just stays on normal polling.
+    """
+    topic = settings.current.pushTopic
+    if not topic:
+        state["watch_topic"] = None
+        scheduler.set_push(token_path, False)
+        return 0
+    if state.get("watch_topic") == topic and state["watch_expiration"] - time.time() > WATCH_RENEW_MARGIN:
+        return 0
+    try:
+        response = state["source"].watch(topic)
+    except NotImplementedError:
+        return 0
+    except Exception as e:
+        logger.warning("Gmail watch on %s for %s failed, polling instead: %s", topic, state["email"], e)
+        state["watch_topic"] = None
+        scheduler.set_push(token_path, False)
+        return QUOTA_UNITS["users.watch"]
+    state["watch_topic"] = topic
+    state["watch_expiration"] = int(response["expiration"]) / 1000
+    scheduler.set_push(token_path, True)
+    logger.info("Push notifications for %s via %s until %s", state["email"], topic,
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(state["watch_expiration"])))
+    return QUOTA_UNITS["users.watch"]
+
+def scan_account(state):
+    """Fetch and queue an account's new mail; returns a ScanResult for the scheduler."""
+    source = state["source"]
+    account_email = state["email"]
+    processed_ids = state["processed_ids"]
+    # Compiled once per settings version, so UI changes apply from the next scan
+    config = scan_config()
+    meeting_keywords = config["keywords"]
+    allowed_mail_ids = config["allowed_mail_ids"]
+    scan_started = time.time()
+    queries = config["plan"].queries(since=state["synced_at"], now=scan_started)
+    # First scan runs the search; later scans only ask history.list for new mail
+    start = time.perf_counter()
+    message_ids, next_history_id, searched = source.sync(queries, state["history_id"])
+    metrics.GMAIL_REQUEST_SECONDS.observe(time.perf_counter() - start, op="list" if searched else "history")
+    new_ids = [msg_id for msg_id in message_ids if msg_id not in processed_ids]
+    # Skip anything handled before a restart without touching the network
+    known = store.known_ids(account_email, new_ids)
+    processed_ids.update(known)
+    new_ids = [msg_id for msg_id in new_ids if msg_id not in known]
+    metrics.MESSAGES.inc(len(known), account=account_email, outcome="known")
+    # Stage one: headers only, in one batch, to drop mail we would discard anyway
+    with metrics.GMAIL_REQUEST_SECONDS.time(op="get_metadata"):
+        metadata = source.get_many(new_ids, format='metadata', metadata_headers=['From', 'Subject'])
+    candidates = []
+    skipped = []
+    for msg_id in new_ids:
+        if msg_id not in metadata:
+            skipped.append(msg_id)
+            continue
+        headers = metadata[msg_id]['payload'].get('headers', [])
+        sender = next((h['value'] for h in headers if h['name'] == 'From'), None)
+        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), None)
+        logger.debug("Checking email from: %s | Subject: %s", sender, subject)
+        sender_email = sender.lower() if sender else ''
+        if allowed_mail_ids and not any(mail_id in sender_email for mail_id in allowed_mail_ids):
+            skipped.append(msg_id)
+            continue
+        # History results skip Gmail's keyword search; a keyword may sit anywhere in
+        # the body, so the classifier judges the full message instead of the snippet
+        candidates.append((msg_id, sender, subject))
+    processed_ids.update(skipped)
+    store.mark_processed(account_email, skipped)
+    metrics.MESSAGES.inc(len(skipped), account=account_email, outcome="skipped")
+    # history.list, or every page of every search query, plus one metadata get per new message
+    if searched:
+        cost = QUOTA_UNITS["messages.list"] * (len(queries) + len(message_ids) // LIST_PAGE_SIZE)
+    else:
+        cost = QUOTA_UNITS["history.list"]
+    cost += QUOTA_UNITS["messages.get"] * len(new_ids)
+    if not is_running:
+        return ScanResult(0, cost)
+    # Stage two: full bodies only for the survivors, parsed off-thread by the pool
+    with metrics.GMAIL_REQUEST_SECONDS.time(op="get_full"):
+        full_messages = source.get_many([c[0] for c in candidates], format='full')
+    metrics.MESSAGES.inc(len(candidates), account=account_email, outcome="candidate")
+    with pipeline_lease() as parser:
+        for msg_id, sender, subject in candidates:
+            msg_data = full_messages.get(msg_id)
+            if msg_data is not None:
+                parser.submit({
+                    "id": msg_id,
+                    "payload": msg_data['payload'],
+                    "subject": subject,
+                    "sender": sender,
+                    "account": account_email,
+                    "keywords": meeting_keywords,
+                }, handle_parsed_message)
             else:
-                gmail_query = f'({keyword_query}) newer_than:30d'
-            print(f"[DEBUG] Gmail query: {gmail_query}")
-            results = service.users().messages().list(userId='me', q=gmail_query, maxResults=50).execute()
-            messages = results.get('messages', [])
-            for msg in messages:
-                if msg['id'] in processed_ids:
-                    continue
-                msg_data = service.users().messages().get(userId='me', id=msg['id'], format='full').execute()
-                sender = next((h['value'] for h in msg_data['payload']['headers'] if h['name'] == 'From'), None)
-                subject = next((h['value'] for h in msg_data['payload']['headers'] if h['name'] == 'Subject'), None)
-                print(f"[DEBUG] Checking email from: {sender} | Subject: {subject}")
-                sender_email = sender.lower() if sender else ''
-                if allowed_mail_ids and not any(mail_id in sender_email for mail_id in allowed_mail_ids):
-                    processed_ids.add(msg['id'])
-                    continue
-                body = decode_body(msg_data['payload'])
-                # Prepend subject so extraction can parse time/date from it too
-                text_to_parse = f"Subject: {subject}\n\n{body}" if subject else body
-                if contains_meeting(text_to_parse, meeting_keywords):
-                    details = extract_meeting_details(text_to_parse)
-                    meeting_obj = {
-                        "id": msg['id'],
-                        "title": details['title'],
-                        "time": details['time'].isoformat() if details['time'] else None,
-                        "sender": sender,
-                        "platform": "Unknown",
-                        "link": details['link'],
-                        "account": account_email
-                    }
-                    meetings.append(meeting_obj)
-                    stats["totalMeetings"] += 1
-                    from src.mail_processor import send_notification
-                    send_notification(sender, details['title'], details['time'], details['link'])
-                processed_ids.add(msg['id'])
-            stats["emailsScanned"] += 1
-            time.sleep(check_interval)
-        except Exception as e:
-            print(f"Error: {e}")
-            time.sleep(60)
+                store.mark_processed(account_email, [msg_id])
+            processed_ids.add(msg_id)
+    # Only advance once the batch is handled so a failed scan is retried
+    state["history_id"] = next_history_id
+    state["synced_at"] = scan_started
+    store.set_history_id(account_email, next_history_id, scan_started)
+    counters.add("emailsScanned")
+    # Parsing runs behind the scan, so this counts meetings found since the previous
+    # scan; plain new mail (newsletters, notifications) does not speed up polling
+    meetings_seen = meeting_counts.get(account_email)
+    activity = meetings_seen - state["meetings_seen"]
+    state["meetings_seen"] = meetings_seen
+    return ScanResult(activity, cost + QUOTA_UNITS["messages.get"] * len(candidates))
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
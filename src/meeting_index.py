@@ -0,0 +1,123 @@
+import bisect
+import threading
+from collections import Counter
+from datetime import datetime
+
+# Meetings without a parsable time sort after every timed meeting
+NO_TIME = float("inf")
+
+
+def meeting_timestamp(meeting):
+    """Epoch seconds for a meeting's start, or NO_TIME when it has none.
+
+    Uses the stored UTC epoch (`startTs`) when present and only falls back to
+    parsing the ISO `time` for meetings recorded before it existed.
+    """
+    if meeting.get("startTs") is not None:
+        return meeting["startTs"]
+    value = meeting.get("time")
+    if not value:
+        return NO_TIME
+    try:
+        # Naive values are local time, matching what extract_meeting_details produces
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return NO_TIME
+
+
+def meeting_accounts(meeting):
+    """Every account that received a meeting (merged duplicates list several)."""
+    return meeting.get("accounts") or [meeting.get("account")]
+
+
+def encode_cursor(key):
+    return f"{key[0]}:{key[1]}"
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    ts, sep, seq = cursor.partition(":")
+    if not sep:
+        raise ValueError(f"malformed cursor {cursor!r}")
+    return float(ts), int(seq)
+
+
+class MeetingIndex:
+    """Time-sorted in-memory index over detected meetings.
+
+    Keys are (timestamp, seq) tuples kept sorted with bisect, globally and per
+    account, so upcoming counts and time-range pages are binary searches.
+    Counters are maintained as meetings are added.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meetings = {}
+        self._key_by_id = {}
+        self._keys = []
+        self._account_keys = {}
+        self._seq = 0
+        self.total = 0
+        self.per_account = Counter()
+
+    def add(self, meeting):
+        with self._lock:
+            self._seq += 1
+            key = (meeting_timestamp(meeting), self._seq)
+            self._meetings[key] = meeting
+            self._key_by_id[(meeting.get("account"), meeting.get("id"))] = key
+            bisect.insort(self._keys, key)
+            for account in meeting_accounts(meeting):
+                bisect.insort(self._account_keys.setdefault(account, []), key)
+                self.per_account[account] += 1
+            self.total += 1
+        return key
+
+    def remove(self, meeting):
+        """Drop a meeting (matched on account and id); returns the stored copy or None."""
+        with self._lock:
+            key = self._key_by_id.pop((meeting.get("account"), meeting.get("id")), None)
+            if key is None:
+                return None
+            stored = self._meetings.pop(key)
+            del self._keys[bisect.bisect_left(self._keys, key)]
+            for account in meeting_accounts(stored):
+                keys = self._account_keys[account]
+                del keys[bisect.bisect_left(keys, key)]
+                self.per_account[account] -= 1
+            self.total -= 1
+            return stored
+
+    def count_upcoming(self, now_ts, account=None):
+        with self._lock:
+            keys = self._keys if account is None else self._account_keys.get(account, [])
+            start = bisect.bisect_right(keys, (now_ts, self._seq))
+            end = bisect.bisect_left(keys, (NO_TIME, 0))
+            return max(0, end - start)
+
+    def query(self, since=None, until=None, account=None, limit=None, cursor=None):
+        """Return (meetings, next_cursor) ordered by meeting time.
+
+        since/until are epoch seconds (until is exclusive); untimed meetings are
+        only included when neither bound is given.
+        """
+        with self._lock:
+            keys = self._keys if account is None else self._account_keys.get(account, [])
+            if cursor:
+                start = bisect.bisect_right(keys, decode_cursor(cursor))
+            elif since is not None:
+                start = bisect.bisect_left(keys, (since, 0))
+            else:
+                start = 0
+            if until is not None:
+                end = bisect.bisect_left(keys, (until, 0))
+            elif since is not None:
+                end = bisect.bisect_left(keys, (NO_TIME, 0))
+            else:
+                end = len(keys)
+            page = keys[start:end]
+            next_cursor = None
+            if limit is not None and len(page) > limit:
+                page = page[:limit]
+                next_cursor = encode_cursor(page[-1])
+            return [self._meetings[key] for key in page], next_cursor
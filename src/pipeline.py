@@ -0,0 +1,233 @@
+import hashlib
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import date
+from concurrent.futures import Future, ProcessPoolExecutor
+from src import metrics
+from src.mail_processor import decode_message, contains_meeting, extract_meeting_details, iter_parts, parse_ics
+
+logger = logging.getLogger(__name__)
+
+# Parse results remembered by content, so blasts to several accounts and resends parse once
+PARSE_CACHE_SIZE = 2048
+
+
+def content_key(payload, subject):
+    """Hash identifying a message's content: its text parts and normalised subject.
+
+    The raw base64 part data is hashed (padding stripped) rather than the
+    decoded text, so a repeat is recognised without paying for the decode.
+    """
+    digest = hashlib.blake2b(" ".join((subject or "").split()).casefold().encode(), digest_size=16)
+    for part in iter_parts(payload):
+        mime_type = part.get('mimeType', '')
+        if mime_type.startswith('text/'):
+            digest.update(b"\0" + mime_type.encode() + b"\0")
+            digest.update(part.get('body', {}).get('data', '').rstrip('=').encode())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Bounded LRU of parse futures.
+
+    Entries are futures, so a duplicate that arrives while the first copy is
+    still being parsed shares its result instead of parsing again. Failed
+    parses are dropped so a later copy retries.
+    """
+
+    def __init__(self, maxsize=PARSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_submit(self, key, submit):
+        """Return (future, hit), calling submit() to start a parse on a miss."""
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return future, True
+            future = self._entries[key] = submit()
+            self.misses += 1
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        future.add_done_callback(lambda f: (f.cancelled() or f.exception() is not None) and self._discard(key, f))
+        return future, False
+
+    def _discard(self, key, future):
+        with self._lock:
+            if self._entries.get(key) is future:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def parse_message(payload, subject, keywords):
+    """Decode, classify and extract one message; runs inside a pool worker.
+
+    Returns (details, timings): details is None for non-meetings, timings
+    maps each stage that ran to its duration in seconds.
+    """
+    timings = {}
+    start = time.perf_counter()
+    decoded = decode_message(payload)
+    timings['decode'] = time.perf_counter() - start
+    # A calendar invite is a meeting by definition: skip the heuristics entirely
+    start = time.perf_counter()
+    ics_details = parse_ics(decoded['calendar'])
+    if ics_details:
+        timings['extract'] = time.perf_counter() - start
+        return {**ics_details, 'method': 'ics'}, timings
+    body = decoded['text']
+    # Prepend subject so extraction can parse time/date from it too
+    text_to_parse = f"Subject: {subject}\n\n{body}" if subject else body
+    start = time.perf_counter()
+    is_meeting = contains_meeting(text_to_parse, keywords)
+    timings['classify'] = time.perf_counter() - start
+    if not is_meeting:
+        return None, timings
+    start = time.perf_counter()
+    details = extract_meeting_details(text_to_parse)
+    timings['extract'] = time.perf_counter() - start
+    return details, timings
+
+
+class _InlineExecutor:
+    """Executor stand-in used when workers=0: runs jobs on the dispatcher thread."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ParsePipeline:
+    """Bounded producer/consumer queue feeding message parsing into a process pool.
+
+    Fetcher threads call submit(), which blocks once max_queue jobs are waiting.
+    Results are handed to each job's callback in submission order. Jobs whose
+    content (and keywords) were parsed before reuse that result; the job's
+    `content_key` is set for the callback either way.
+    """
+
+    def __init__(self, workers=2, max_queue=200):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._jobs = queue.Queue(maxsize=max_queue)
+        self._pending = deque()
+        self._pending_ready = threading.Condition()
+        # Keep the pool busy without letting finished results pile up unread
+        self._in_flight = threading.Semaphore(max(workers, 1) * 2)
+        self._executor = None
+        self._cache = ParseCache()
+        self._threads = []
+        self.processed = 0
+        self.failed = 0
+
+    def start(self):
+        if self._executor is not None:
+            return self
+        self._executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 0 else _InlineExecutor()
+        self._threads = [
+            threading.Thread(target=self._dispatch, daemon=True),
+            threading.Thread(target=self._collect, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def submit(self, job, callback):
+        """Queue a job dict with payload/subject/keywords keys; blocks when full."""
+        self._jobs.put((job, callback))
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "queueDepth": self._jobs.qsize(),
+            "queueCapacity": self.max_queue,
+            "inFlight": len(self._pending),
+            "processed": self.processed,
+            "failed": self.failed,
+            "cacheHits": self._cache.hits,
+            "cacheMisses": self._cache.misses,
+            "cacheSize": len(self._cache),
+        }
+
+    def stop(self):
+        if self._executor is None:
+            return
+        self._jobs.put(None)
+        for t in self._threads:
+            t.join()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    @staticmethod
+    def _record(timings, details):
+        for stage, seconds in timings.items():
+            metrics.STAGE_SECONDS.observe(seconds, stage=stage)
+        if details is not None:
+            metrics.EXTRACT_METHOD.inc(method=details.get('method', 'unknown'))
+
+    def _dispatch(self):
+        while True:
+            item = self._jobs.get()
+            self._in_flight.acquire()
+            if item is None:
+                future, hit = None, False
+            else:
+                job, _ = item
+                job['content_key'] = content_key(job['payload'], job.get('subject'))
+                # Keywords change classification, and fuzzy dates resolve against today
+                key = (job['content_key'], tuple(job.get('keywords') or ()), date.today())
+                future, hit = self._cache.get_or_submit(key, lambda: self._executor.submit(
+                    parse_message, job['payload'], job.get('subject'), job.get('keywords')))
+                metrics.PARSE_CACHE.inc(result="hit" if hit else "miss")
+            with self._pending_ready:
+                self._pending.append((item, future, hit))
+                self._pending_ready.notify()
+            if item is None:
+                return
+
+    def _collect(self):
+        while True:
+            with self._pending_ready:
+                while not self._pending:
+                    self._pending_ready.wait()
+                item, future, hit = self._pending[0]
+                if item is None:
+                    # Take the stop signal off too, so stats() reports nothing in flight
+                    self._pending.popleft()
+                    self._in_flight.release()
+                    return
+            job, callback = item
+            try:
+                details, timings = future.result()
+            except Exception as e:
+                self.failed += 1
+                metrics.PARSE_FAILURES.inc()
+                logger.error("Parsing message %s failed: %s", job.get('id'), e)
+            else:
+                self.processed += 1
+                if not hit:
+                    self._record(timings, details)
+                try:
+                    callback(job, details)
+                except Exception:
+                    logger.exception("Handling parsed message %s failed", job.get('id'))
+            with self._pending_ready:
+                self._pending.popleft()
+            self._in_flight.release()
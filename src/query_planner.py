@@ -0,0 +1,54 @@
+"""Gmail search queries for full syncs.
+
+Gmail rejects or silently truncates very long `q` strings, so instead of
+one query with every keyword (or only the first few), the keyword and sender
+OR-sets are split into chunks and each combination becomes its own query.
+The caller runs them side by side and merges the message IDs.
+"""
+import time
+
+# OR terms per group: what one query reliably handled before keywords were split
+TERMS_PER_QUERY = 12
+# How far back a full sync searches when there is no earlier scan to resume from
+WINDOW_DAYS = 30
+# Start the search a little before the last scan: Gmail indexes new mail with some delay
+RESUME_OVERLAP = 15 * 60
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)] or [[]]
+
+
+def _or_group(terms):
+    return terms[0] if len(terms) == 1 else "(" + " OR ".join(terms) + ")"
+
+
+class QueryPlan:
+    """The search queries for one set of keywords and allowed senders.
+
+    Built once per settings version; queries(since) only adds the time
+    clause, which depends on when the account was last synced.
+    """
+
+    def __init__(self, keywords, senders=(), terms_per_query=TERMS_PER_QUERY, window_days=WINDOW_DAYS):
+        self.window_days = window_days
+        # Keywords are matched as phrases anywhere in the message (no subject: prefix)
+        keyword_groups = [[f'"{kw}"' for kw in chunk] for chunk in _chunks(list(keywords), terms_per_query)]
+        sender_groups = [[f"from:{s}" for s in chunk] for chunk in _chunks(list(senders), terms_per_query)]
+        self.base_queries = [
+            " ".join(_or_group(group) for group in (senders, words) if group)
+            for senders in sender_groups for words in keyword_groups
+        ]
+
+    def queries(self, since=None, now=None):
+        """Full queries covering mail since `since` (epoch seconds), capped at the window."""
+        now = time.time() if now is None else now
+        oldest = now - self.window_days * 86400
+        if since is None or since - RESUME_OVERLAP <= oldest:
+            window = f"newer_than:{self.window_days}d"
+        else:
+            window = f"after:{int(since - RESUME_OVERLAP)}"
+        return [f"{query} {window}".strip() for query in self.base_queries]
+
+    def __len__(self):
+        return len(self.base_queries)
@@ -0,0 +1,293 @@
+import asyncio
+import heapq
+import logging
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# What a scan reports back: how much meeting-like mail it found and the API quota it used
+ScanResult = namedtuple('ScanResult', ['activity', 'cost'])
+
+# Adaptive interval bounds, as multiples of the configured checkInterval
+MIN_FACTOR = 0.25
+MAX_FACTOR = 4.0
+# Growth per quiet scan; activity halves the interval straight away
+QUIET_GROWTH = 1.25
+# Longest wait after repeated failures
+MAX_BACKOFF = 3600
+
+
+class AccountPacer:
+    """Adaptive polling interval for one account.
+
+    The interval is kept as a factor of the base interval so checkInterval
+    changes apply at once. Meeting-like mail halves it (down to MIN_FACTOR),
+    each quiet scan grows it by QUIET_GROWTH (up to MAX_FACTOR). Failures
+    back off exponentially from retry_delay; rate-limit errors back off twice
+    as hard.
+    """
+
+    def __init__(self, retry_delay):
+        self.retry_delay = retry_delay
+        self.factor = 1.0
+        self.failures = 0
+        self.last_activity = None
+
+    def on_success(self, activity):
+        self.failures = 0
+        if activity > 0:
+            self.factor = max(MIN_FACTOR, self.factor / 2)
+            self.last_activity = time.time()
+        else:
+            self.factor = min(MAX_FACTOR, self.factor * QUIET_GROWTH)
+
+    def on_error(self, rate_limited=False):
+        """Record a failed scan; returns the delay before retrying."""
+        self.failures += 1
+        exponent = self.failures if rate_limited else self.failures - 1
+        return min(MAX_BACKOFF, self.retry_delay * 2 ** exponent)
+
+    def interval(self, base):
+        return base * self.factor
+
+
+class QuotaBudget:
+    """Token bucket of API quota units shared by every account.
+
+    Scans spend their cost after they run, so the balance can go negative;
+    new scans are then held back until it refills.
+    """
+
+    def __init__(self, units_per_minute):
+        self.units_per_minute = units_per_minute
+        self.tokens = float(units_per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        rate = self.units_per_minute / 60
+        self.tokens = min(self.units_per_minute, self.tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def spend(self, units):
+        self._refill()
+        self.tokens -= units
+
+    def wait_time(self):
+        """Seconds until the balance is back to zero (0 when scans may run now)."""
+        self._refill()
+        if self.tokens >= 0 or self.units_per_minute <= 0:
+            return 0
+        return -self.tokens / (self.units_per_minute / 60)
+
+    def set_rate(self, units_per_minute):
+        self._refill()
+        self.units_per_minute = units_per_minute
+        self.tokens = min(self.tokens, units_per_minute)
+
+
+class MonitorScheduler:
+    """Polls many accounts from one event loop using a heap of scan deadlines.
+
+    `scan(token_path)` is the blocking per-account scan; it runs on a small
+    thread pool capped at max_concurrency. It returns False to drop the account,
+    or a ScanResult that drives that account's AccountPacer and the shared
+    QuotaBudget. `interval()` gives the base polling interval in seconds, read
+    fresh each time. `is_rate_limited(exc)` picks out quota/overload errors.
+    Accounts marked with set_push() get their mail via push notifications and
+    trigger(); they are only polled every `push_interval()` seconds as a safety net.
+    """
+
+    def __init__(self, scan, interval, max_concurrency=8, jitter=0.1, retry_delay=60,
+                 quota_per_minute=6000, is_rate_limited=None, push_interval=None):
+        self.scan = scan
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.is_rate_limited = is_rate_limited or (lambda exc: False)
+        self.push_interval = push_interval or (lambda: 30 * 60)
+        self.budget = QuotaBudget(quota_per_minute)
+        self.running = False
+        self._accounts = set()
+        self._pacers = {}
+        self._pushed = set()
+        self._rescan = set()
+        self._heap = []
+        self._deadlines = {}
+        self._scanning = set()
+        self._tasks = set()
+        self._wake = asyncio.Event()
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._executor = None
+        self._loop_task = None
+
+    def add(self, token_path, delay=0):
+        """Register an account; a no-op if it is already being monitored."""
+        if token_path in self._accounts:
+            return False
+        self._accounts.add(token_path)
+        self._schedule(token_path, delay)
+        return True
+
+    def remove(self, token_path):
+        # Heap entries are dropped lazily when their deadline no longer matches
+        self._accounts.discard(token_path)
+        self._deadlines.pop(token_path, None)
+        self._pacers.pop(token_path, None)
+        self._pushed.discard(token_path)
+        self._rescan.discard(token_path)
+
+    def trigger(self, token_path):
+        """Scan an account now instead of at its next deadline (e.g. on a push notification)."""
+        if not self.running or token_path not in self._accounts:
+            return False
+        if token_path in self._scanning:
+            # Mail may have landed after the running scan listed history: go again when it ends
+            self._rescan.add(token_path)
+        else:
+            self._schedule(token_path, 0)
+        return True
+
+    def set_push(self, token_path, enabled):
+        if enabled:
+            self._pushed.add(token_path)
+        else:
+            self._pushed.discard(token_path)
+
+    def start(self, token_paths=()):
+        if not self.running:
+            self.running = True
+            self._executor = self._new_executor()
+            self._loop_task = asyncio.create_task(self._run())
+        for path in token_paths:
+            # Spread the first round over a few seconds instead of firing all at once
+            self.add(path, delay=random.uniform(0, min(5, len(token_paths) * 0.1)))
+
+    def set_max_concurrency(self, max_concurrency):
+        """Resize the scan pool; scans already running finish on the old one."""
+        self.max_concurrency = max_concurrency
+        self._limit = asyncio.Semaphore(max_concurrency)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = self._new_executor()
+
+    async def stop(self):
+        """Stop scheduling immediately; scans already on a thread finish in the background."""
+        self.running = False
+        self._accounts.clear()
+        self._heap.clear()
+        self._deadlines.clear()
+        self._pacers.clear()
+        self._pushed.clear()
+        self._rescan.clear()
+        self._wake.set()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._loop_task:
+            self._loop_task.cancel()
+            self._loop_task = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _new_executor(self):
+        return ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="monitor")
+
+    def status(self):
+        now = time.monotonic()
+        base = self.interval()
+        accounts = [dict(self._account_status(path, base), nextScanIn=round(max(0, deadline - now), 1), scanning=False)
+                    for path, deadline in self._deadlines.items()]
+        accounts += [dict(self._account_status(path, base), nextScanIn=0, scanning=True) for path in self._scanning]
+        return {
+            "running": self.running,
+            "maxConcurrency": self.max_concurrency,
+            "baseInterval": base,
+            "quota": {"unitsPerMinute": self.budget.units_per_minute,
+                      "available": round(self.budget.tokens), "waitSeconds": round(self.budget.wait_time(), 1)},
+            "accounts": accounts,
+        }
+
+    def _account_status(self, path, base):
+        pacer = self._pacer(path)
+        return {"account": path, "interval": round(self._interval_for(path, base), 1), "push": path in self._pushed,
+                "failures": pacer.failures, "lastActivity": pacer.last_activity}
+
+    def _interval_for(self, token_path, base):
+        if token_path in self._pushed:
+            return self.push_interval()
+        return self._pacer(token_path).interval(base)
+
+    def _pacer(self, token_path):
+        pacer = self._pacers.get(token_path)
+        if pacer is None:
+            pacer = self._pacers[token_path] = AccountPacer(self.retry_delay)
+        return pacer
+
+    def _schedule(self, token_path, delay):
+        deadline = time.monotonic() + delay
+        self._deadlines[token_path] = deadline
+        heapq.heappush(self._heap, (deadline, token_path))
+        self._wake.set()
+
+    def _jittered(self, delay):
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run(self):
+        while self.running:
+            now = time.monotonic()
+            # Out of quota: leave due scans queued until the budget refills
+            throttle = self.budget.wait_time() if self._heap and self._heap[0][0] <= now else 0
+            while not throttle and self._heap and self._heap[0][0] <= now:
+                deadline, path = heapq.heappop(self._heap)
+                if self._deadlines.get(path) != deadline:
+                    continue
+                del self._deadlines[path]
+                self._scanning.add(path)
+                task = asyncio.create_task(self._scan(path))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            timeout = throttle or (self._heap[0][0] - now if self._heap else None)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _scan(self, token_path):
+        result, delay = None, None
+        try:
+            async with self._limit:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._executor, self.scan, token_path)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            rate_limited = self.is_rate_limited(e)
+            delay = self._pacer(token_path).on_error(rate_limited)
+            logger.error("Scan of %s failed%s: %s; retrying in %.0fs", token_path,
+                         " (rate limited)" if rate_limited else "", e, delay)
+        finally:
+            self._scanning.discard(token_path)
+        if result is False:
+            self.remove(token_path)
+            return
+        # Anything other than a ScanResult (e.g. a skipped scan) leaves the pacing alone
+        if isinstance(result, ScanResult):
+            self.budget.spend(result.cost)
+            if delay is None:
+                self._pacer(token_path).on_success(result.activity)
+        if self.running and token_path in self._accounts:
+            rescan = token_path in self._rescan
+            self._rescan.discard(token_path)
+            if delay is not None:
+                delay = self._jittered(delay)
+            elif rescan:
+                delay = 0
+            else:
+                delay = self._jittered(self._interval_for(token_path, self.interval()))
+            self._schedule(token_path, delay)
@@ -0,0 +1,161 @@
+"""Monitor state shared between scan threads and request handlers.
+
+Readers never take a lock: settings are an immutable snapshot swapped in
+whole, and the account registry is copy-on-write. Writers serialise on a
+lock and publish a new object instead of mutating the one readers hold.
+"""
+import threading
+from collections import Counter
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+DEFAULT_KEYWORDS = "meeting, zoom, conference, appointment, masterclass, workshop, meet, gmeet, google meet"
+# Fields never echoed back to clients
+SECRET_SETTINGS = frozenset({"pushToken"})
+
+
+class Settings(BaseModel):
+    """User settings. Unknown keys are ignored; numbers may arrive as strings from the UI."""
+
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    checkInterval: int = Field(5, ge=1, le=24 * 60)
+    alertTime: int = Field(10, ge=0, le=7 * 24 * 60)
+    emailKeywords: str = DEFAULT_KEYWORDS
+    allowedMailIds: str = ""
+    parseWorkers: int = Field(2, ge=0, le=64)
+    maxConcurrentScans: int = Field(8, ge=1, le=256)
+    quotaUnitsPerMinute: int = Field(6000, ge=1)
+    alarmWebhook: Optional[str] = None
+    # Pub/Sub topic Gmail publishes to ("projects/<project>/topics/<topic>"); empty disables push mode
+    pushTopic: str = ""
+    # Shared secret the push subscription appends to its endpoint URL as ?token=
+    pushToken: str = ""
+    pushSafetyNetMinutes: int = Field(30, ge=1)
+
+
+class SettingsStore:
+    """Versioned, validated settings with change notification.
+
+    `current` is a frozen Settings; update() validates the merged values
+    before swapping them in, so a bad request changes nothing. Subscribers
+    are called as fn(settings, changed_field_names) after each change.
+    """
+
+    def __init__(self, **values):
+        self._lock = threading.Lock()
+        # Version and snapshot are published together so derived() never mixes them
+        self._snapshot = (1, Settings(**values))
+        self._subscribers = []
+
+    @property
+    def current(self):
+        return self._snapshot[1]
+
+    @property
+    def version(self):
+        return self._snapshot[0]
+
+    def get(self, name, default=None):
+        value = getattr(self.current, name, None)
+        return default if value is None else value
+
+    def as_dict(self):
+        """The current settings for API responses, without SECRET_SETTINGS."""
+        return self.current.model_dump(exclude=SECRET_SETTINGS)
+
+    def update(self, values):
+        """Apply a partial update; returns the names that changed. Raises ValidationError."""
+        with self._lock:
+            version, current = self._snapshot
+            updated = Settings.model_validate({**current.model_dump(), **values})
+            changed = {name for name in Settings.model_fields if getattr(updated, name) != getattr(current, name)}
+            if not changed:
+                return changed
+            self._snapshot = (version + 1, updated)
+        for fn in list(self._subscribers):
+            fn(updated, changed)
+        return changed
+
+    def subscribe(self, fn):
+        self._subscribers.append(fn)
+        return fn
+
+    def derived(self, fn):
+        """Return a getter for fn(settings) that recomputes only when the settings change."""
+        cache = [None, None]
+
+        def get():
+            version, current = self._snapshot
+            if cache[0] != version:
+                # Racing threads may both compute; either result is valid for this version
+                cache[:] = [version, fn(current)]
+            return cache[1]
+        return get
+
+
+class Counters:
+    """Named counters that many threads can bump at once."""
+
+    def __init__(self, *names):
+        self._lock = threading.Lock()
+        self._values = Counter({name: 0 for name in names})
+
+    def add(self, name, amount=1):
+        with self._lock:
+            self._values[name] += amount
+
+    def get(self, name):
+        return self._values[name]
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class AccountRegistry:
+    """Per-account scan state (one shard per token path), copy-on-write.
+
+    Each shard is owned by its account's scans and carries its own lock;
+    adding or dropping an account publishes a new mapping, so handlers can
+    iterate accounts while scan threads come and go.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shards = {}
+
+    def get(self, token_path, default=None):
+        return self._shards.get(token_path, default)
+
+    def __getitem__(self, token_path):
+        return self._shards[token_path]
+
+    def __setitem__(self, token_path, state):
+        with self._lock:
+            self._shards = {**self._shards, token_path: state}
+
+    def pop(self, token_path, default=None):
+        with self._lock:
+            if token_path not in self._shards:
+                return default
+            shards = dict(self._shards)
+            state = shards.pop(token_path)
+            self._shards = shards
+            return state
+
+    def __contains__(self, token_path):
+        return token_path in self._shards
+
+    def __len__(self):
+        return len(self._shards)
+
+    def items(self):
+        """A stable view of the accounts right now."""
+        return self._shards.items()
+
+    def find(self, email):
+        """Token path of the account with this email address, or None."""
+        email = email.lower()
+        return next((path for path, state in self._shards.items() if state["email"].lower() == email), None)
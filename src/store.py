@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(BASE_DIR, "meetings.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    account TEXT,
+    accounts TEXT,
+    title TEXT,
+    time TEXT,
+    start_ts INTEGER,
+    end_time TEXT,
+    sender TEXT,
+    platform TEXT,
+    link TEXT,
+    uid TEXT,
+    sequence INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (account, id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS meetings_dedup_key ON meetings(dedup_key);
+CREATE INDEX IF NOT EXISTS meetings_account ON meetings(account);
+CREATE INDEX IF NOT EXISTS meetings_start_ts ON meetings(start_ts);
+CREATE INDEX IF NOT EXISTS meetings_uid ON meetings(uid);
+CREATE TABLE IF NOT EXISTS processed (
+    account TEXT NOT NULL,
+    message_id TEXT NOT NULL,
+    PRIMARY KEY (account, message_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_state (
+    account TEXT PRIMARY KEY,
+    history_id TEXT,
+    synced_at REAL
+);
+"""
+
+MEETING_COLUMNS = ("id", "title", "time", "startTs", "end", "sender", "platform", "link", "account", "accounts", "uid")
+# Meeting dict keys whose column name differs
+COLUMN_NAMES = {"end": "end_time", "startTs": "start_ts"}
+
+
+def _select_columns():
+    return ", ".join(f"{COLUMN_NAMES[c]} AS {c}" if c in COLUMN_NAMES else c for c in MEETING_COLUMNS)
+
+
+def _to_meeting(row):
+    meeting = dict(row)
+    meeting["accounts"] = json.loads(meeting["accounts"])
+    return meeting
+
+
+class MeetingStore:
+    """SQLite-backed store of detected meetings, processed message IDs and sync state.
+
+    Meetings are deduplicated on `dedup_key` (the iCalendar UID or a hash of
+    the message content), so the same invite delivered to several monitored
+    accounts is kept once, with every receiving account listed in `accounts`.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def known_ids(self, account, message_ids):
+        """Return the subset of message_ids already processed for this account."""
+        known = set()
+        ids = list(message_ids)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT message_id FROM processed WHERE account = ? AND message_id IN ({placeholders})",
+                    [account, *chunk]).fetchall()
+            known.update(row[0] for row in rows)
+        return known
+
+    def mark_processed(self, account, message_ids):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO processed (account, message_id) VALUES (?, ?)",
+                [(account, msg_id) for msg_id in message_ids])
+
+    def add_meeting(self, meeting, dedup_key=None, sequence=0):
+        """Insert a meeting dict; returns False if its dedup key was already stored."""
+        columns = [COLUMN_NAMES.get(c, c) for c in MEETING_COLUMNS]
+        values = [meeting.get(col) for col in MEETING_COLUMNS]
+        values[MEETING_COLUMNS.index("accounts")] = json.dumps(meeting.get("accounts") or [meeting["account"]])
+        with self._lock:
+            cur = self._conn.execute(
+                f"INSERT OR IGNORE INTO meetings ({', '.join(columns)}, sequence, dedup_key) "
+                f"VALUES ({', '.join('?' * len(columns))}, ?, ?)",
+                [*values, sequence, dedup_key or f"{meeting['account']}:{meeting['id']}"])
+        return cur.rowcount == 1
+
+    def find_by_uid(self, uid):
+        """The stored meeting for an iCalendar UID with its SEQUENCE, or (None, None)."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_select_columns()}, sequence FROM meetings WHERE uid = ?", (uid,)).fetchone()
+        if row is None:
+            return None, None
+        meeting = _to_meeting(row)
+        return meeting, meeting.pop("sequence")
+
+    def update_by_uid(self, uid, fields, sequence):
+        """Apply an invite update (title/time/end/link) to the meeting with this UID."""
+        assignments = ", ".join(f"{COLUMN_NAMES.get(k, k)} = ?" for k in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE meetings SET {assignments}, sequence = ? WHERE uid = ?",
+                               [*fields.values(), sequence, uid])
+
+    def merge_account(self, dedup_key, account):
+        """Record that `account` also received the meeting stored under dedup_key.
+
+        Returns the updated meeting, or None if there is no such meeting or it
+        already lists the account.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT rowid, {_select_columns()} FROM meetings WHERE dedup_key = ?", (dedup_key,)).fetchone()
+            if row is None:
+                return None
+            meeting = _to_meeting(row)
+            rowid = meeting.pop("rowid")
+            if account in meeting["accounts"]:
+                return None
+            meeting["accounts"].append(account)
+            self._conn.execute("UPDATE meetings SET accounts = ? WHERE rowid = ?",
+                               (json.dumps(meeting["accounts"]), rowid))
+        return meeting
+
+    def delete_by_uid(self, uid):
+        with self._lock:
+            return self._conn.execute("DELETE FROM meetings WHERE uid = ?", (uid,)).rowcount
+
+    def meetings(self, account=None):
+        """All stored meetings, optionally those one account received, in detection order."""
+        query = f"SELECT {_select_columns()} FROM meetings"
+        params = []
+        if account:
+            query += " WHERE EXISTS (SELECT 1 FROM json_each(accounts) WHERE value = ?)"
+            params.append(account)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return [_to_meeting(row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+    def get_history_id(self, account):
+        with self._lock:
+            row = self._conn.execute("SELECT history_id FROM sync_state WHERE account = ?", (account,)).fetchone()
+        return row[0] if row else None
+
+    def get_synced_at(self, account):
+        """Epoch seconds of the account's last completed scan, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT synced_at FROM sync_state WHERE account = ?", (account,)).fetchone()
+        return row[0] if row else None
+
+    def set_history_id(self, account, history_id, synced_at=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sync_state (account, history_id, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(account) DO UPDATE SET history_id = excluded.history_id, "
+                "synced_at = COALESCE(excluded.synced_at, synced_at)",
+                (account, history_id, synced_at))